@@ -54,6 +54,22 @@ class FoxProblem:
                 successors.append(new_state)
         return successors
 
+    def get_predecessors(self, state):
+        """
+        Generate all valid states that have the given state as a successor.
+
+        Every crossing can be undone by rowing the same animals back, so the
+        state graph is undirected and the predecessors of a state are exactly
+        its successors. Used by bidirectional search to expand from the goal.
+
+        Args:
+            state (Tuple[int, int, int]): The current state.
+
+        Returns:
+            List[Tuple[int, int, int]]: A list of all valid predecessor states.
+        """
+        return self.get_successors(state)
+
     def is_legal_state(self, state):
         """
         Check if a state is legal.
@@ -97,3 +113,118 @@ class FoxProblem:
 
     def __str__(self):
         return f"Chickens and foxes problem: Start State {self.start_state}"
+
+
+class PackedFoxProblem(FoxProblem):
+    """
+    FoxProblem with each (chickens, foxes, boat) state packed into one int.
+
+    States are laid out on a grid padded by two cells on every side, so a
+    boat crossing is a constant integer offset and moves that would leave the
+    grid land on padding. The packed codes of all legal states are
+    precomputed once into a set, so generating a successor is one addition
+    and one lookup, with no tuple building or bank arithmetic.
+    """
+
+    # Same crossings as FoxProblem.get_successors, as (chickens, foxes) taken from the left bank
+    MOVES = [(2, 0), (1, 0), (1, 1), (0, 1), (0, 2)]
+
+    def __init__(self, start_state):
+        super().__init__(start_state)
+        # Two padding cells on each side absorb moves of up to two animals
+        self.fox_stride = self.total_foxes + 5
+        self.chicken_stride = self.fox_stride * 2
+
+        # A dense bitmap over the grid grows with chickens * foxes, while the
+        # legal states are only a thin band of it, so store just their codes
+        self.legal = set()
+        for chickens in range(self.total_chickens + 1):
+            low, high = self.legal_fox_range(chickens)
+            for foxes in range(low, high + 1):
+                self.legal.add(self.encode((chickens, foxes, 0)))
+                self.legal.add(self.encode((chickens, foxes, 1)))
+
+        # Offsets for crossings from the right bank (boat == 0) and the left bank (boat == 1)
+        self.deltas = [
+            [dc * self.chicken_stride + df * 2 + 1 for dc, df in self.MOVES],
+            [-dc * self.chicken_stride - df * 2 - 1 for dc, df in self.MOVES],
+        ]
+
+        self.start_state = self.encode(start_state)
+        self.goal_state = self.encode((0, 0, 0))
+
+    def legal_fox_range(self, chickens):
+        """
+        Return the (low, high) range of fox counts on the left bank that keeps
+        both banks safe when the left bank holds the given number of chickens.
+        The range is empty when low > high.
+        """
+        chickens_right = self.total_chickens - chickens
+        # Left bank: foxes may not outnumber chickens, unless there are none
+        high = min(self.total_foxes, chickens) if chickens > 0 else self.total_foxes
+        # Right bank: same rule for the animals that have crossed
+        low = max(0, self.total_foxes - chickens_right) if chickens_right > 0 else 0
+        return low, high
+
+    def encode(self, state):
+        """Pack a (chickens, foxes, boat) tuple into an int."""
+        chickens, foxes, boat = state
+        return (chickens + 2) * self.chicken_stride + (foxes + 2) * 2 + boat
+
+    def decode(self, code):
+        """Unpack an int produced by encode back into a (chickens, foxes, boat) tuple."""
+        chickens, rest = divmod(code, self.chicken_stride)
+        foxes, boat = divmod(rest, 2)
+        return (chickens - 2, foxes - 2, boat)
+
+    def decode_path(self, path):
+        """Unpack every state of a solution path."""
+        return [self.decode(code) for code in path]
+
+    def get_successors(self, state):
+        """
+        Generate all valid successor codes of a packed state.
+
+        Args:
+            state (int): The current packed state.
+
+        Returns:
+            List[int]: A list of all valid successor codes.
+        """
+        legal = self.legal
+        return [state + delta for delta in self.deltas[state & 1] if state + delta in legal]
+
+    def get_predecessors(self, state):
+        return self.get_successors(state)
+
+    def get_layer_successors(self, layer):
+        """
+        Generate the successors of a whole BFS layer at once.
+
+        Each crossing offset is applied to the full layer in one comprehension
+        and filtered against the precomputed legal set. Every state in a BFS layer of
+        this problem has the boat on the same bank, so one offset table serves
+        the whole layer. layered_bfs_search uses this in place of
+        get_successors.
+
+        Args:
+            layer (Sequence[int]): Packed states sharing the same boat position.
+
+        Returns:
+            List[Tuple[int, int]]: (successor, parent) pairs for every legal
+            crossing from the layer; a successor reached from several states
+            of the layer appears once per parent.
+        """
+        if not layer:
+            return []
+        legal = self.legal
+        pairs = []
+        for delta in self.deltas[layer[0] & 1]:
+            pairs.extend([(code + delta, code) for code in layer if code + delta in legal])
+        return pairs
+
+    def is_legal_state(self, state):
+        return state in self.legal
+
+    def __str__(self):
+        return f"Chickens and foxes problem (packed): Start State {self.decode(self.start_state)}"
@@ -0,0 +1,146 @@
+from itertools import product
+
+
+class RiverCrossingProblem:
+    """
+    Generalised chickens-and-foxes problem with any number of species,
+    any boat capacity, and a list of predator rules.
+
+    A state is a tuple (count_0, ..., count_k-1, boat) giving how many animals
+    of each species are on the left bank, with boat == 1 when the boat is on
+    the left bank. The goal is to move every animal to the right bank.
+
+    A predator rule (predator, prey) of species indices says that on either
+    bank the predators may not outnumber the prey, unless no prey are there.
+    FoxProblem is RiverCrossingProblem((c, f, 1), boat_capacity=2,
+    predators=[(1, 0)]).
+    """
+
+    def __init__(self, start_state, boat_capacity=2, predators=((1, 0),)):
+        self.start_state = tuple(start_state)
+        self.totals = self.start_state[:-1]
+        self.num_species = len(self.totals)
+        self.goal_state = (0,) * self.num_species + (0,)
+        self.boat_capacity = boat_capacity
+        self.predators = tuple(predators)
+
+        # The boat carries between 1 and boat_capacity animals, so the legal
+        # loads depend only on the instance: build them once here rather
+        # than on every get_successors call.
+        self.moves = [
+            load for load in product(*(range(min(boat_capacity, total), -1, -1)
+                                       for total in self.totals))
+            if 1 <= sum(load) <= boat_capacity
+        ]
+        # Memoised legality of each left-bank configuration
+        self.legal_banks = {}
+
+    def get_successors(self, state):
+        """
+        Generate all valid successor states from the current state.
+
+        Args:
+            state (Tuple[int, ...]): The current state.
+
+        Returns:
+            List[Tuple[int, ...]]: A list of all valid successor states.
+        """
+        successors = []
+        left = state[:-1]
+        boat = state[-1]
+        legal_banks = self.legal_banks
+
+        if boat == 1:
+            # Animals leave the left bank, so each load is bounded by what is there
+            available = left
+            sign = -1
+        else:
+            available = tuple(total - count for total, count in zip(self.totals, left))
+            sign = 1
+
+        for load in self.moves:
+            if any(taken > there for taken, there in zip(load, available)):
+                continue
+            new_left = tuple(count + sign * taken for count, taken in zip(left, load))
+            legal = legal_banks.get(new_left)
+            if legal is None:
+                legal = self.is_legal_bank(new_left)
+                legal_banks[new_left] = legal
+            if legal:
+                successors.append(new_left + (1 - boat,))
+        return successors
+
+    def get_predecessors(self, state):
+        """
+        Every crossing can be undone by rowing the same animals back, so the
+        predecessors of a state are exactly its successors.
+        """
+        return self.get_successors(state)
+
+    def is_legal_bank(self, left):
+        """
+        Check whether a left-bank configuration leaves both banks safe.
+
+        Args:
+            left (Tuple[int, ...]): Number of each species on the left bank.
+
+        Returns:
+            bool: True if no predator rule is broken on either bank.
+        """
+        for predator, prey in self.predators:
+            prey_left = left[prey]
+            if prey_left > 0 and left[predator] > prey_left:
+                return False
+            prey_right = self.totals[prey] - prey_left
+            if prey_right > 0 and self.totals[predator] - left[predator] > prey_right:
+                return False
+        return True
+
+    def is_legal_state(self, state):
+        """
+        Check if a state is legal.
+
+        Args:
+            state (Tuple[int, ...]): The state to check.
+
+        Returns:
+            bool: True if the state is legal, False otherwise.
+        """
+        left = state[:-1]
+        if any(count < 0 or count > total for count, total in zip(left, self.totals)):
+            return False
+        return self.is_legal_bank(left)
+
+    def is_goal_state(self, state):
+        return state == self.goal_state
+
+    def __str__(self):
+        return (f"River crossing problem: Start State {self.start_state}, "
+                f"boat capacity {self.boat_capacity}, predators {list(self.predators)}")
+
+
+# Some test code
+
+if __name__ == "__main__":
+    from FoxProblem import FoxProblem
+    from uninformed_search import bfs_search, dfs_search, ids_search
+
+    # The classic problem gives solutions as short as FoxProblem's
+    fox331 = bfs_search(FoxProblem((3, 3, 1)))
+    river331 = bfs_search(RiverCrossingProblem((3, 3, 1)))
+    print(river331)
+    print("same length as FoxProblem:", len(fox331.path) == len(river331.path))
+
+    print(dfs_search(RiverCrossingProblem((5, 5, 1), boat_capacity=3)))
+    print(ids_search(RiverCrossingProblem((4, 4, 1), boat_capacity=3)))
+
+    # Three species in a food chain (chickens, foxes, grain):
+    #  foxes eat chickens, chickens eat grain
+    food_chain = RiverCrossingProblem((3, 3, 3, 1), boat_capacity=3,
+                                      predators=[(1, 0), (0, 2)])
+    print(bfs_search(food_chain))
+
+    # Large populations and a big boat
+    print(bfs_search(RiverCrossingProblem((200, 200, 1), boat_capacity=6)))
+    print(bfs_search(RiverCrossingProblem((100, 90, 100, 1), boat_capacity=5,
+                                          predators=[(1, 0), (0, 2)])))
@@ -1,9 +1,58 @@
+from functools import wraps
+from json import dumps
+from time import perf_counter
+
 class SearchSolution:
+    # Set to True to have the searches record timers and counters in
+    # `metrics`; while False they skip all of that bookkeeping.
+    instrument = False
+
     def __init__(self, problem, search_method):
         self.problem_name = str(problem)
         self.search_method = search_method
         self.path = []
         self.nodes_visited = 0
+        self.cache_hits = 0
+        self.layer_sizes = []
+        self.metrics = {}
+
+    def timed(self, function, metric):
+        """
+        Wrap function so that its running time is added to metrics[metric].
+        Returns function unchanged when instrumentation is off.
+        """
+        if not self.instrument:
+            return function
+        metrics = self.metrics
+        metrics.setdefault(metric, 0.0)
+
+        def timed_function(*args):
+            start = perf_counter()
+            result = function(*args)
+            metrics[metric] += perf_counter() - start
+            return result
+        return timed_function
+
+    def record_peak(self, metric, size):
+        if size > self.metrics.get(metric, 0):
+            self.metrics[metric] = size
+
+    def count(self, metric, amount=1):
+        self.metrics[metric] = self.metrics.get(metric, 0) + amount
+
+    def to_dict(self):
+        return {
+            "problem": self.problem_name,
+            "search_method": self.search_method,
+            "nodes_visited": self.nodes_visited,
+            "solution_length": len(self.path),
+            "cache_hits": self.cache_hits,
+            "layer_sizes": list(self.layer_sizes),
+            "metrics": dict(self.metrics),
+        }
+
+    def to_json(self):
+        return dumps(self.to_dict())
 
     def __str__(self):
         string = "----\n"
@@ -22,4 +71,24 @@ class SearchSolution:
             string += "no solution found after visiting {:d} nodes\n"
             string = string.format(self.problem_name, self.search_method, self.nodes_visited)
 
+        if self.layer_sizes:
+            string += "frontier size per layer: {:s}\n".format(str(self.layer_sizes))
+        if self.cache_hits:
+            string += "successor cache hits: {:d}\n".format(self.cache_hits)
+
         return string
+
+def timed_search(search_function):
+    """
+    Decorator for search functions: records the wall time of the whole
+    search in the returned solution's metrics when instrumentation is on.
+    """
+    @wraps(search_function)
+    def wrapper(*args, **kwargs):
+        if not SearchSolution.instrument:
+            return search_function(*args, **kwargs)
+        start = perf_counter()
+        solution = search_function(*args, **kwargs)
+        solution.metrics["wall_time"] = perf_counter() - start
+        return solution
+    return wrapper
@@ -1,5 +1,5 @@
-from FoxProblem import FoxProblem
-from uninformed_search import bfs_search, dfs_search, ids_search
+from FoxProblem import FoxProblem, PackedFoxProblem
+from uninformed_search import bfs_search, dfs_search, ids_search, bidirectional_bfs_search, layered_bfs_search
 
 # Create a few test problems:
 problem331 = FoxProblem((3, 3, 1))
@@ -22,3 +22,29 @@ print(ids_search(problem541))
 print(bfs_search(problem551))
 print(dfs_search(problem551))
 print(ids_search(problem551))
+
+# Bidirectional BFS meets in the middle from the start and goal states
+print(bidirectional_bfs_search(problem331))
+print(bidirectional_bfs_search(problem541))
+print(bidirectional_bfs_search(problem551))
+
+# IDS reusing successor lists of the shallow levels between iterations
+print(ids_search(problem541, cache_depth=8))
+print(ids_search(problem551, cache_depth=8))
+
+# BFS with states interned in a NodeStore and array-backed parent pointers
+print(bfs_search(problem541, compact=True))
+
+# Packed integer states: solve with any search, then decode the path
+packed541 = PackedFoxProblem((5, 4, 1))
+packed_solution = bfs_search(packed541)
+print(packed_solution)
+print("decoded path:", packed541.decode_path(packed_solution.path))
+
+# Layered BFS reports how wide the frontier gets at each depth
+print(layered_bfs_search(problem541))
+
+# The packed problem expands each layer in one batch
+packed_layered = layered_bfs_search(packed541)
+print(packed_layered)
+print("decoded path:", packed541.decode_path(packed_layered.path))
@@ -1,6 +1,9 @@
 
+from array import array
 from collections import deque
-from SearchSolution import SearchSolution
+from multiprocessing import Pool, cpu_count
+from time import perf_counter
+from SearchSolution import SearchSolution, timed_search
 
 # you might find a SearchNode class useful to wrap state objects,
 # keep track of current depth for the dfs, and point to parent node
@@ -11,6 +14,8 @@ class SearchNode:
     It contains a reference to its parent node and the action taken to reach this state.
     """
 
+    __slots__ = ("state", "parent", "action", "cost")
+
     def __init__(self, state, parent=None, action=None, cost=0):
         self.state = state   
         self.parent = parent   
@@ -23,6 +28,60 @@ class SearchNode:
     def __hash__(self):
         return hash(self.state)
 
+class NodeStore:
+    """
+    Compact alternative to a tree of SearchNodes.
+
+    Each distinct state is interned once and identified by an integer index;
+    parent pointers are kept as indices in an array('i'), with -1 for the root.
+    A node then costs one table entry and four bytes instead of an object.
+    """
+
+    def __init__(self):
+        self.states = []
+        self.interned = set()
+        self.parents = array('i')
+
+    def add(self, state, parent=-1):
+        """
+        Intern a state reached from the given parent index.
+
+        Args:
+        state: The state to store.
+        parent (int, optional): Index of the parent node. Defaults to -1 (root).
+
+        Returns:
+        int: Index of the new node.
+        """
+        index = len(self.states)
+        self.states.append(state)
+        self.interned.add(state)
+        self.parents.append(parent)
+        return index
+
+    def __contains__(self, state):
+        return state in self.interned
+
+    def __len__(self):
+        return len(self.states)
+
+    def backchain(self, index):
+        """
+        Reconstruct the path from the root to the node with the given index.
+
+        Args:
+        index (int): Index of the end node of the path.
+
+        Returns:
+        list: A list of states representing the path from start to end.
+        """
+        path = []
+        while index != -1:
+            path.append(self.states[index])
+            index = self.parents[index]
+        path.reverse()
+        return path
+
 # you might write other helper functions, too. For example,
 # I like to separate out backchaining, and the dfs path checking functions
 
@@ -43,7 +102,8 @@ def backchain(node):
     path.reverse()
     return path
 
-def bfs_search(search_problem):
+@timed_search
+def bfs_search(search_problem, compact=False):
     """
     Perform a breadth-first search on the given search problem.
 
@@ -52,53 +112,522 @@ def bfs_search(search_problem):
         - start_state: The initial state.
         - is_goal_state(state): Returns True if the given state is a goal state.
         - get_successors(state): Returns a list of successor states.
+    compact (bool, optional): Keep nodes in a NodeStore instead of SearchNodes.
+        Defaults to False.
 
     Returns:
     SearchSolution: An object containing the solution path and search statistics.
     """
+    if compact:
+        return compact_bfs_search(search_problem)
+
     start_state = search_problem.start_state
     root = SearchNode(state=start_state)
     frontier = deque([root])  # Queue for BFS
     visited = set()
     solution = SearchSolution(search_problem, "BFS")
+    instrument = solution.instrument
+    is_goal_state = solution.timed(search_problem.is_goal_state, "goal_test_time")
+    get_successors = solution.timed(search_problem.get_successors, "successor_time")
 
     while frontier:
         node = frontier.popleft()
         state = node.state
 
         if state in visited:
+            if instrument:
+                solution.count("duplicates_pruned")
             continue
         visited.add(state)
         solution.nodes_visited += 1
 
-        if search_problem.is_goal_state(state):
+        if is_goal_state(state):
             # Goal found, reconstruct the path
             solution.path = backchain(node)
             return solution
 
-        successors = search_problem.get_successors(state)
+        successors = get_successors(state)
         for successor_state in successors:
             if successor_state not in visited:
                 child_node = SearchNode(successor_state, parent=node)
                 frontier.append(child_node)
+            elif instrument:
+                solution.count("duplicates_pruned")
+
+        if instrument:
+            solution.record_peak("peak_frontier", len(frontier))
+            solution.record_peak("peak_visited", len(visited))
+
+    # No solution found
+    return solution
+
+@timed_search
+def compact_bfs_search(search_problem):
+    """
+    Breadth-first search that keeps its tree in a NodeStore.
+
+    The frontier holds integer node indices and the intern table doubles as the
+    visited set, so each state is stored once, when it is first generated.
+
+    Args:
+    search_problem: An object representing the search problem.
+
+    Returns:
+    SearchSolution: An object containing the solution path and search statistics.
+    """
+    solution = SearchSolution(search_problem, "BFS (compact)")
+    store = NodeStore()
+    frontier = deque([store.add(search_problem.start_state)])
+    states = store.states
+    instrument = solution.instrument
+    is_goal_state = solution.timed(search_problem.is_goal_state, "goal_test_time")
+    get_successors = solution.timed(search_problem.get_successors, "successor_time")
+
+    while frontier:
+        index = frontier.popleft()
+        state = states[index]
+        solution.nodes_visited += 1
+
+        if is_goal_state(state):
+            solution.path = store.backchain(index)
+            return solution
+
+        for successor_state in get_successors(state):
+            if successor_state not in store:
+                frontier.append(store.add(successor_state, index))
+            elif instrument:
+                solution.count("duplicates_pruned")
+
+        if instrument:
+            solution.record_peak("peak_frontier", len(frontier))
+            solution.record_peak("peak_visited", len(store))
+
+    # No solution found
+    return solution
+
+@timed_search
+def layered_bfs_search(search_problem):
+    """
+    Perform a level-synchronous breadth-first search on the given search problem.
+
+    States are deduplicated when they are generated rather than when they are
+    dequeued: the parent map doubles as the visited set, so every state enters
+    the frontier at most once and each layer holds distinct states.
+
+    A problem with a get_layer_successors(layer) method, returning
+    (successor, parent) pairs, has each layer expanded in one call instead
+    of state by state.
+
+    Args:
+    search_problem: An object representing the search problem.
+
+    Returns:
+    SearchSolution: An object containing the solution path and search statistics.
+        layer_sizes lists the number of states in each expanded layer.
+    """
+    solution = SearchSolution(search_problem, "Layered BFS")
+    instrument = solution.instrument
+    is_goal_state = solution.timed(search_problem.is_goal_state, "goal_test_time")
+    get_successors = solution.timed(search_problem.get_successors, "successor_time")
+    get_layer_successors = getattr(search_problem, "get_layer_successors", None)
+    if get_layer_successors is not None:
+        get_layer_successors = solution.timed(get_layer_successors, "successor_time")
+    start_state = search_problem.start_state
+    parents = {start_state: None}
+    layer = [start_state]
+
+    while layer:
+        solution.layer_sizes.append(len(layer))
+        if instrument:
+            solution.record_peak("peak_frontier", len(layer))
+            solution.record_peak("peak_visited", len(parents))
+        for state in layer:
+            solution.nodes_visited += 1
+            if is_goal_state(state):
+                path = chain_to_root(parents, state)
+                path.reverse()
+                solution.path = path
+                return solution
+
+        if get_layer_successors is not None:
+            pairs = get_layer_successors(layer)
+        else:
+            pairs = ((successor_state, state) for state in layer for successor_state in get_successors(state))
+        next_layer = []
+        for successor_state, state in pairs:
+            if successor_state not in parents:
+                parents[successor_state] = state
+                next_layer.append(successor_state)
+            elif instrument:
+                solution.count("duplicates_pruned")
+        layer = next_layer
+
+    # No solution found
+    return solution
+
+# Problem object held by each worker of a parallel BFS pool, so it is sent
+#  to every worker once instead of with every chunk of states
+_worker_problem = None
+
+def _init_worker(search_problem):
+    global _worker_problem
+    _worker_problem = search_problem
+
+def successor_states(search_problem, state):
+    """
+    Return the successor states of state, dropping actions if the problem
+    pairs them with its successors (as the Mazeworld problems do).
+    """
+    if hasattr(search_problem, "goal_test"):
+        return [successor for successor, action in search_problem.get_successors(state)]
+    return search_problem.get_successors(state)
+
+def _expand_chunk(states):
+    return [successor_states(_worker_problem, state) for state in states]
+
+@timed_search
+def parallel_bfs_search(search_problem, processes=None, min_parallel_layer=256):
+    """
+    Perform a level-synchronous breadth-first search, expanding each layer
+    across a multiprocessing pool.
+
+    Each layer is cut into one chunk per worker and the successor lists come
+    back to the parent process, which merges them into the parent map at the
+    layer barrier, dropping duplicates. States must be picklable. Works with
+    problems using either is_goal_state (PA1) or goal_test with
+    (state, action) successors (PA2).
+
+    Args:
+    search_problem: An object representing the search problem.
+    processes (int, optional): Number of worker processes. Defaults to None (one per core).
+    min_parallel_layer (int, optional): Layers smaller than this are expanded
+        in the parent process, where the pool overhead would dominate. Defaults to 256.
+
+    Returns:
+    SearchSolution: An object containing the solution path and search statistics.
+        layer_sizes lists the number of states in each expanded layer.
+    """
+    solution = SearchSolution(search_problem, "Parallel BFS")
+    instrument = solution.instrument
+    if hasattr(search_problem, "goal_test"):
+        is_goal_state = search_problem.goal_test
+    else:
+        is_goal_state = search_problem.is_goal_state
+    is_goal_state = solution.timed(is_goal_state, "goal_test_time")
+
+    start_state = search_problem.start_state
+    parents = {start_state: None}
+    layer = [start_state]
+
+    workers = processes or cpu_count()
+    # the pool is only started once a layer is big enough to use it
+    pool = None
+    try:
+        while layer:
+            solution.layer_sizes.append(len(layer))
+            if instrument:
+                solution.record_peak("peak_frontier", len(layer))
+                solution.record_peak("peak_visited", len(parents))
+            for state in layer:
+                solution.nodes_visited += 1
+                if is_goal_state(state):
+                    path = chain_to_root(parents, state)
+                    path.reverse()
+                    solution.path = path
+                    return solution
+
+            # Time spent in workers is not visible here, so successor_time
+            #  measures the whole expansion including pool transfers
+            expansion_start = perf_counter() if instrument else 0
+            if len(layer) < min_parallel_layer:
+                successor_lists = [successor_states(search_problem, state) for state in layer]
+            else:
+                if pool is None:
+                    pool = Pool(workers, initializer=_init_worker, initargs=(search_problem,))
+                chunk_size = -(-len(layer) // workers)
+                successor_lists = pool.map(_expand_chunk,
+                    [layer[i:i + chunk_size] for i in range(0, len(layer), chunk_size)])
+                successor_lists = [successors for chunk in successor_lists for successors in chunk]
+            if instrument:
+                solution.count("successor_time", perf_counter() - expansion_start)
+
+            # Layer barrier: merge into the parent map, dropping duplicates
+            next_layer = []
+            for state, successors in zip(layer, successor_lists):
+                for successor_state in successors:
+                    if successor_state not in parents:
+                        parents[successor_state] = state
+                        next_layer.append(successor_state)
+                    elif instrument:
+                        solution.count("duplicates_pruned")
+            layer = next_layer
+    finally:
+        if pool is not None:
+            pool.terminate()
 
     # No solution found
     return solution
 
-# Don't forget that your dfs function should be recursive and do path checking,
+def chain_to_root(parents, state):
+    """
+    Follow a parent map from the given state back to the root of its search.
+
+    Args:
+    parents (dict): Maps each reached state to the state it was reached from (root maps to None).
+    state: The state to start from.
+
+    Returns:
+    list: A list of states from the given state back to the root.
+    """
+    path = []
+    while state is not None:
+        path.append(state)
+        state = parents[state]
+    return path
+
+def expand_layer(frontier, parents, other_parents, expand, solution=None):
+    """
+    Expand one whole BFS layer and record where it touches the other search.
+
+    Args:
+    frontier (list): The states of the layer to expand.
+    parents (dict): Parent map of this search, updated with newly reached states.
+    other_parents (dict): Parent map of the opposite search.
+    expand: Function returning the neighbours of a state in this direction.
+    solution (SearchSolution, optional): Solution whose duplicates_pruned metric
+        is updated when instrumentation is on. Defaults to None.
+
+    Returns:
+    tuple: (next_layer, meeting_states) where meeting_states are states reached
+        by both searches.
+    """
+    next_layer = []
+    meeting_states = []
+    instrument = solution is not None and solution.instrument
+    for state in frontier:
+        for neighbour in expand(state):
+            if neighbour in parents:
+                if instrument:
+                    solution.count("duplicates_pruned")
+                continue
+            parents[neighbour] = state
+            next_layer.append(neighbour)
+            if neighbour in other_parents:
+                meeting_states.append(neighbour)
+    return next_layer, meeting_states
+
+@timed_search
+def bidirectional_bfs_search(search_problem):
+    """
+    Perform a bidirectional breadth-first search on the given search problem.
+
+    One BFS grows forward from the start state and another grows backward from
+    the goal state; the smaller frontier is expanded a full layer at a time until
+    the two meet. Problems without get_predecessors or a goal_state fall back
+    to bfs_search.
+
+    Args:
+    search_problem: An object representing the search problem with:
+        - start_state: The initial state.
+        - goal_state: The single goal state.
+        - get_successors(state): Returns a list of successor states.
+        - get_predecessors(state): Returns a list of predecessor states.
+
+    Returns:
+    SearchSolution: An object containing the solution path and search statistics.
+        nodes_visited counts the expansions of both frontiers.
+    """
+    if not hasattr(search_problem, "get_predecessors") or \
+       getattr(search_problem, "goal_state", None) is None:
+        return bfs_search(search_problem)
+
+    solution = SearchSolution(search_problem, "Bidirectional BFS")
+    start_state = search_problem.start_state
+    goal_state = search_problem.goal_state
+
+    if start_state == goal_state:
+        solution.nodes_visited = 1
+        solution.path = [start_state]
+        return solution
+
+    forward_parents = {start_state: None}
+    backward_parents = {goal_state: None}
+    forward_frontier = [start_state]
+    backward_frontier = [goal_state]
+    instrument = solution.instrument
+    get_successors = solution.timed(search_problem.get_successors, "successor_time")
+    get_predecessors = solution.timed(search_problem.get_predecessors, "successor_time")
+
+    while forward_frontier and backward_frontier:
+        if instrument:
+            solution.record_peak("peak_frontier", len(forward_frontier) + len(backward_frontier))
+            solution.record_peak("peak_visited", len(forward_parents) + len(backward_parents))
+        # Always grow the smaller side; this is what keeps both trees shallow
+        if len(forward_frontier) <= len(backward_frontier):
+            solution.nodes_visited += len(forward_frontier)
+            forward_frontier, meeting_states = expand_layer(
+                forward_frontier, forward_parents, backward_parents,
+                get_successors, solution)
+        else:
+            solution.nodes_visited += len(backward_frontier)
+            backward_frontier, meeting_states = expand_layer(
+                backward_frontier, backward_parents, forward_parents,
+                get_predecessors, solution)
+
+        if meeting_states:
+            # Every meeting state in this layer gives a path; keep the shortest
+            best_path = None
+            for state in meeting_states:
+                path = chain_to_root(forward_parents, state)
+                path.reverse()
+                path.extend(chain_to_root(backward_parents, backward_parents[state]))
+                if best_path is None or len(path) < len(best_path):
+                    best_path = path
+            solution.path = best_path
+            return solution
+
+    # One side ran out of states: the goal is unreachable
+    return solution
+
+# Don't forget that your dfs function should do path checking,
 # rather than memoizing (no visited set!) to be memory efficient
 
-# We pass the solution along to each new recursive call to dfs_search
-#  so that statistics like number of nodes visited or recursion depth
-#  might be recorded
+# The dfs functions below walk the tree with an explicit stack instead of
+#  recursing once per ply, so deep state spaces do not hit Python's
+#  recursion limit. The shared `path` set still holds exactly the states on
+#  the current branch, and the solution is passed along so that statistics
+#  like number of nodes visited might be recorded.
+
+# Marks an exhausted successor iterator on the dfs stack
+_DONE = object()
+
+# Returned by dfs_engine when the depth limit pruned at least one node,
+#  following the failure/cutoff distinction in Russell & Norvig
+CUTOFF = "cutoff"
 
+class SuccessorCache:
+    """
+    Bounded cache of successor lists for states near the root.
+
+    Iterative deepening re-expands the shallow levels of the tree on every
+    iteration; only states expanded at depth < max_depth are cached, and no
+    new entries are added once max_size states are stored.
+    """
+
+    def __init__(self, max_depth, max_size=100000):
+        self.max_depth = max_depth
+        self.max_size = max_size
+        self.successors = {}
+        self.hits = 0
+
+    def get_successors(self, get_successors, state, depth):
+        """
+        Return the successors of state, using the cache for shallow depths.
+
+        Args:
+        get_successors: The problem's successor function.
+        state: The state being expanded.
+        depth (int): Depth of state below the root.
+
+        Returns:
+        list: The successor states.
+        """
+        if depth >= self.max_depth:
+            return get_successors(state)
+        successors = self.successors.get(state)
+        if successors is not None:
+            self.hits += 1
+            return successors
+        successors = get_successors(state)
+        if len(self.successors) < self.max_size:
+            self.successors[state] = successors
+        return successors
+
+def dfs_engine(search_problem, node, solution, path, limit=None, cache=None):
+    """
+    Explicit-stack depth-first search shared by dfs_search and depth_limited_search.
+
+    The current branch is kept as a stack of states with a matching stack of
+    successor iterators, so no SearchNode is built below the starting node.
+    Nodes are visited in the same order as the recursive formulation.
+
+    Args:
+    search_problem: An object representing the search problem.
+    node (SearchNode): The node to start searching from.
+    solution (SearchSolution): The current solution object.
+    path (set): A set of states in the current path.
+    limit (int, optional): Maximum depth below node to search. Defaults to None (unbounded).
+    cache (SuccessorCache, optional): Cache for successor lists of shallow states. Defaults to None.
+
+    Returns:
+    True if a goal state is found, CUTOFF if the depth limit pruned part of
+    the tree, False otherwise.
+    """
+    instrument = solution.instrument
+    is_goal_state = solution.timed(search_problem.is_goal_state, "goal_test_time")
+    get_successors = solution.timed(search_problem.get_successors, "successor_time")
+
+    solution.nodes_visited += 1
+    if is_goal_state(node.state):
+        solution.path = backchain(node)
+        return True
+    if limit is not None and limit <= 0:
+        return CUTOFF
+    if node.state in path:
+        return False
+
+    cutoff = False
+    path.add(node.state)
+    states = [node.state]
+    if cache is None:
+        iterators = [iter(get_successors(node.state))]
+    else:
+        iterators = [iter(cache.get_successors(get_successors, node.state, 0))]
+
+    while iterators:
+        successor_state = next(iterators[-1], _DONE)
+        if successor_state is _DONE:
+            # Backtrack
+            iterators.pop()
+            path.remove(states.pop())
+            continue
+
+        solution.nodes_visited += 1
+        if is_goal_state(successor_state):
+            # Ancestors of the starting node come from its parent chain
+            solution.path = backchain(node)[:-1] + states + [successor_state]
+            return True
+        # Path checking: avoid cycles by checking the current path
+        if successor_state in path:
+            if instrument:
+                solution.count("duplicates_pruned")
+            continue
+        if limit is not None and len(states) >= limit:
+            cutoff = True
+            continue
+
+        path.add(successor_state)
+        if cache is None:
+            iterators.append(iter(get_successors(successor_state)))
+        else:
+            iterators.append(iter(cache.get_successors(get_successors, successor_state, len(states))))
+        states.append(successor_state)
+        if instrument:
+            # The frontier of a dfs is the current branch, and the path set
+            #  is all it remembers
+            solution.record_peak("peak_frontier", len(states))
+            solution.record_peak("peak_visited", len(path))
+
+    return CUTOFF if cutoff else False
+
+@timed_search
 def dfs_search(search_problem, node=None, solution=None, path=None):
     """
     Perform a depth-first search on the given search problem.
 
     Args:
     search_problem: An object representing the search problem.
-    node (SearchNode, optional): The current node being explored. Defaults to None.
+    node (SearchNode, optional): The node to start exploring from. Defaults to None.
     solution (SearchSolution, optional): The current solution object. Defaults to None.
     path (set, optional): A set of states in the current path. Defaults to None.
 
@@ -110,51 +639,43 @@ def dfs_search(search_problem, node=None, solution=None, path=None):
         solution = SearchSolution(search_problem, "DFS")
         path = set()
 
-    solution.nodes_visited += 1
-
-    # Base Case: Goal State
-    # Memory is polynomial
-    if search_problem.is_goal_state(node.state):
-        solution.path = backchain(node)
-        return solution
-
-    # Path checking: avoid cycles by checking the current path
-    if node.state in path:
-        return solution  # Return the solution object even if no solution found along this path
-
-    path.add(node.state)
-
-    successors = search_problem.get_successors(node.state)
-    for successor_state in successors:
-        child_node = SearchNode(successor_state, parent=node)
-        # Recursively call dfs_search
-        result = dfs_search(search_problem, child_node, solution, path)
-        if result.path:
-            return result  # Goal found
-
-    path.remove(node.state)  # Backtrack
-    return solution  # Return the solution object
+    dfs_engine(search_problem, node, solution, path)
+    return solution
 
 # Adapted from Page 88, Russell, S. J., & Norvig, P. (2020)
-def ids_search(search_problem, depth_limit=100):
+@timed_search
+def ids_search(search_problem, depth_limit=100, cache_depth=0, max_cache_size=100000):
     """
     Perform an iterative deepening search on the given search problem.
 
+    Stops as soon as an iteration finishes without any depth cutoff, since
+    deeper iterations would explore exactly the same tree.
+
     Args:
     search_problem: An object representing the search problem.
     depth_limit (int, optional): The maximum depth to search. Defaults to 100.
+    cache_depth (int, optional): Cache successor lists of states expanded above
+        this depth across iterations. Defaults to 0 (no caching).
+    max_cache_size (int, optional): Maximum number of cached states. Defaults to 100000.
 
     Returns:
     SearchSolution: An object containing the solution path and search statistics.
+        nodes_visited counts logical expansions; cache_hits counts the
+        get_successors calls answered from the cache.
     """
     solution = SearchSolution(search_problem, "IDS")
+    cache = SuccessorCache(cache_depth, max_cache_size) if cache_depth > 0 else None
 
     for depth in range(depth_limit):
         path = set()
         node = SearchNode(search_problem.start_state)
-        result = depth_limited_search(node, path, depth, solution, search_problem)
-        if result:
+        result = dfs_engine(search_problem, node, solution, path, depth, cache)
+        if cache is not None:
+            solution.cache_hits = cache.hits
+        if result is True:
             return solution  # Goal found
+        if result is not CUTOFF:
+            return solution  # Whole tree explored, deeper passes are pointless
     # No solution found within the depth limit
     return solution
 
@@ -172,21 +693,4 @@ def depth_limited_search(node, path, limit, solution, search_problem):
     Returns:
     bool: True if a goal state is found within the depth limit, False otherwise.
     """
-    solution.nodes_visited += 1
-    if search_problem.is_goal_state(node.state):
-        solution.path = backchain(node)
-        return True
-    if limit <= 0:
-        return False
-    if node.state in path:
-        return False
-
-    path.add(node.state)
-    successors = search_problem.get_successors(node.state)
-    for successor_state in successors:
-        child_node = SearchNode(successor_state, parent=node)
-        if depth_limited_search(child_node, path, limit - 1, solution, search_problem):
-            return True
-    path.remove(node.state)  # Backtrack
-    return False
-
+    return dfs_engine(search_problem, node, solution, path, limit) is True
@@ -3,6 +3,11 @@
 # PA2 Mazeworld
 # Maze.py
 
+import hashlib
+import mmap
+import os
+import struct
+from array import array
 from time import sleep
 
 # Maze.py
@@ -27,72 +32,244 @@ from time import sleep
 #    . is a floor
 # the command \robot x y adds a robot at a location. The first robot added
 # has index 0, and so forth.
+#
+# Maze.load(filename) reads a maze through a binary cache file next to it
+#  (filename + ".bin"), rebuilt whenever the .maz file is newer; large mazes
+#  then reload in milliseconds.
+
+# translation table from maze file bytes to floor flags
+FLOOR_TABLE = bytes(1 if c == ord(".") else 0 for c in range(256))
+
+CACHE_MAGIC = b"MAZ1"
+CACHE_HEADER = struct.Struct("<4siii")
 
 
 class Maze:
 
     # internal structure:
-    #   self.walls: set of tuples with wall locations
+    #   self.map: bytearray of the maze file characters, row by row from the
+    #     top, used for rendering
     #   self.width: number of columns
-    #   self.rows
+    #   self.height: number of rows
+    #   self.floor: bytearray over the maze padded by a one-cell wall border,
+    #     1 for floor cells; indexed by self.cell(x, y)
+    #   self.robot_count: dict from each occupied (x, y) to the number of
+    #     robots on it, kept in step with self.robotloc
+    #
+    # robotloc is stored as a tuple, so it can only be replaced by assignment
+    #  or changed with move_robot, and robot_count always stays in step with it.
 
     def __init__(self, mazefilename):
 
-        self.robotloc = []
-        # read the maze file into a list of strings
-        f = open(mazefilename)
-        lines = []
-        for line in f:
-            line = line.strip()
-            # ignore blank limes
-            if len(line) == 0:
+        robotloc = []
+        rows = bytearray()
+        width = 0
+        height = 0
+        # memory-map the file and copy each maze row straight into one
+        #  bytearray, rather than holding a string per line or per cell
+        with open(mazefilename, "rb") as f, \
+             mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            line = data.readline()
+            while line:
+                line = line.strip()
+                # ignore blank limes
+                if len(line) == 0:
+                    pass
+                elif line[0] == ord("\\"):
+                    # there's only one command, \robot, so assume it is that
+                    parms = line.split()
+                    robotloc.append(int(parms[1]))
+                    robotloc.append(int(parms[2]))
+                else:
+                    width = width or len(line)
+                    rows += line
+                    height += 1
+                line = data.readline()
+
+        self.build(width, height, rows, robotloc)
+
+
+    # sets up the grids from the raw maze characters; shared by the text
+    #  and binary loaders
+    def build(self, width, height, rows, robotloc, floor=None):
+        self.width = width
+        self.height = height
+        self.map = rows
+        self.padded_width = width + 2
+
+        if floor is None:
+            floor = bytearray(self.padded_width * (height + 2))
+            # row i of the file holds y = height - i - 1, stored at padded row y + 1
+            for i in range(height):
+                start = (height - i) * self.padded_width + 1
+                floor[start:start + width] = rows[i * width:(i + 1) * width].translate(FLOOR_TABLE)
+        self.floor = floor
+
+        self._layout_key = None
+        self.robot_count = {}
+        self._robotloc = None
+        self.robotloc = robotloc
+
+
+    # loads a maze through its binary cache, creating or refreshing the
+    #  cache if needed; a damaged cache is rebuilt from the maze file
+    @classmethod
+    def load(cls, mazefilename, cachefilename=None):
+        cachefilename = cachefilename or mazefilename + ".bin"
+        if os.path.exists(cachefilename) and \
+           os.path.getmtime(cachefilename) >= os.path.getmtime(mazefilename):
+            try:
+                return cls.load_binary(cachefilename)
+            except ValueError:
                 pass
-            elif line[0] == "\\":
-                #print("command")
-                # there's only one command, \robot, so assume it is that
-                parms = line.split()
-                x = int(parms[1])
-                y = int(parms[2])
-                self.robotloc.append(x)
-                self.robotloc.append(y)
-            else:
-                lines.append(line)
-        f.close()
+        maze = cls(mazefilename)
+        maze.save_binary(cachefilename)
+        return maze
+
+
+    # binary form: header (magic, width, height, number of robot coordinates),
+    #  the robot coordinates, the maze characters and the padded floor grid.
+    #  It is written to a temporary file first, so that an interrupted write
+    #  never leaves a truncated cache behind.
+    def save_binary(self, filename):
+        robotloc = array("i", self.robotloc or ())
+        temporary = filename + ".tmp"
+        with open(temporary, "wb") as f:
+            f.write(CACHE_HEADER.pack(CACHE_MAGIC, self.width, self.height, len(robotloc)))
+            f.write(robotloc.tobytes())
+            f.write(self.map)
+            f.write(self.floor)
+        os.replace(temporary, filename)
+
+
+    # raises ValueError if the file is not a complete maze cache
+    @classmethod
+    def load_binary(cls, filename):
+        with open(filename, "rb") as f:
+            header = f.read(CACHE_HEADER.size)
+            if len(header) != CACHE_HEADER.size:
+                raise ValueError(f"{filename} is not a maze cache file")
+            magic, width, height, robot_coords = CACHE_HEADER.unpack(header)
+            if magic != CACHE_MAGIC or width < 0 or height < 0 or robot_coords < 0 or robot_coords % 2:
+                raise ValueError(f"{filename} is not a maze cache file")
+            sections = [f.read(size) for size in
+                        (4 * robot_coords, width * height, (width + 2) * (height + 2))]
+            if [len(section) for section in sections] != \
+               [4 * robot_coords, width * height, (width + 2) * (height + 2)] or f.read(1):
+                raise ValueError(f"{filename} is truncated or has trailing data")
+
+        robotloc = array("i")
+        robotloc.frombytes(sections[0])
+        maze = cls.__new__(cls)
+        maze.build(width, height, bytearray(sections[1]), list(robotloc), bytearray(sections[2]))
+        return maze
+
+
+    # returns a maze with the same walls and a different set of robots; the
+    #  map and floor grid are shared, only the robot occupancy is new
+    def with_robots(self, robotloc):
+        maze = self.__class__.__new__(self.__class__)
+        maze.build(self.width, self.height, self.map, robotloc, self.floor)
+        maze._layout_key = self._layout_key
+        return maze
+
+
+    # a digest of the walls, the same for every maze with this layout, for
+    #  keying caches; computed on first use and shared with the mazes made
+    #  by with_robots
+    def layout_key(self):
+        if self._layout_key is None:
+            digest = hashlib.sha1(b"%d %d " % (self.width, self.height))
+            digest.update(self.floor)
+            self._layout_key = digest.hexdigest()
+        return self._layout_key
 
-        self.width = len(lines[0])
-        self.height = len(lines)
 
-        self.map = list("".join(lines))
+    def index(self, x, y):
+        return (self.height - y - 1) * self.width + x
 
 
+    # index of (x, y) in the padded grids; valid for -1 <= x <= width
+    #  and -1 <= y <= height
+    def cell(self, x, y):
+        return (y + 1) * self.padded_width + x + 1
+
+
+    @property
+    def robotloc(self):
+        return self._robotloc
+
+    @robotloc.setter
+    def robotloc(self, robotloc):
+        # clear the old robots from the occupancy grid, then add the new ones
+        if robotloc is not None:
+            robotloc = tuple(robotloc)
+        self.count_robots(self._robotloc, -1)
+        self.count_robots(robotloc, 1)
+        self._robotloc = robotloc
+
+
+    def count_robots(self, robotloc, delta):
+        robotloc = robotloc or ()
+        for i in range(0, len(robotloc) - 1, 2):
+            self.add_robot_count(robotloc[i], robotloc[i + 1], delta)
 
-    def index(self, x, y):
-        return (self.height - y - 1) * self.width + x
+
+    # keyed by location rather than by cell, so robots off the grid are
+    #  counted without an index check
+    def add_robot_count(self, x, y, delta):
+        count = self.robot_count.get((x, y), 0) + delta
+        if count:
+            self.robot_count[(x, y)] = count
+        else:
+            del self.robot_count[(x, y)]
+
+
+    # moves one robot and updates the occupancy grid incrementally
+    def move_robot(self, robot, x, y):
+        robotloc = list(self._robotloc)
+        old_x = robotloc[robot * 2]
+        old_y = robotloc[robot * 2 + 1]
+        self.add_robot_count(old_x, old_y, -1)
+        self.add_robot_count(x, y, 1)
+        robotloc[robot * 2] = x
+        robotloc[robot * 2 + 1] = y
+        self._robotloc = tuple(robotloc)
 
 
     # returns True if the location is a floor
     def is_floor(self, x, y):
-        if x < 0 or x >= self.width:
-            return False
-        if y < 0 or y >= self.height:
-            return False
-
-        return self.map[self.index(x, y)] == "."
+        # the wall border means only coordinates more than one cell outside
+        #  the maze need an explicit check
+        if -1 <= x <= self.width and -1 <= y <= self.height:
+            return self.floor[(y + 1) * self.padded_width + x + 1] == 1
+        return False
 
 
+    # robots off the grid are counted but, as ever, not reported
     def has_robot(self, x, y):
-        if x < 0 or x >= self.width:
-            return False
-        if y < 0 or y >= self.height:
-            return False
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return (x, y) in self.robot_count
+        return False
 
-        for i in range(0, len(self.robotloc), 2):
-            rx = self.robotloc[i]
-            ry = self.robotloc[i + 1]
-            if rx == x and ry == y:
-                return True
 
-        return False
+    # batched versions of is_floor and has_robot: take an iterable of (x, y)
+    #  pairs and return a list of booleans, one per pair
+    def floor_mask(self, locations):
+        floor = self.floor
+        cell = self.cell
+        width = self.width
+        height = self.height
+        return [-1 <= x <= width and -1 <= y <= height and floor[cell(x, y)] == 1
+                for x, y in locations]
+
+
+    def robot_mask(self, locations):
+        robot_count = self.robot_count
+        width = self.width
+        height = self.height
+        return [0 <= x < width and 0 <= y < height and (x, y) in robot_count
+                for x, y in locations]
 
 
     # function called only by __str__ that takes the map and the
@@ -100,7 +277,7 @@ class Maze:
     #  that they will need to be printed out in.
     def create_render_list(self):
         #print(self.robotloc)
-        renderlist = list(self.map)
+        renderlist = list(self.map.decode())
 
         robot_number = 0
         for index in range(0, len(self.robotloc), 2):
@@ -157,3 +334,7 @@ if __name__ == "__main__":
     print(test_maze3.is_floor(1, 0))
 
     print(test_maze3.has_robot(1, 0))
+
+    print(test_maze3.floor_mask([(2, 3), (-1, 3), (1, 0)]))
+    test_maze3.move_robot(0, 1, 2)
+    print(test_maze3.robot_mask([(1, 0), (1, 2)]))
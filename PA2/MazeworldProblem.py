@@ -4,8 +4,57 @@
 # MazeworldProblem.py
 
 from Maze import Maze
+from array import array
+from collections import OrderedDict, deque
+from operator import itemgetter
 from time import sleep
 
+# Moves in the order get_successors tries them, with their action names;
+#  (0, 0) is the "stay" action
+MOVES = [(-1, 0), (1, 0), (0, -1), (0, 1), (0, 0)]
+ACTION_NAMES = {(-1, 0): "west", (1, 0): "east", (0, -1): "south", (0, 1): "north"}
+
+# Exact single-robot distance grids, keyed by (maze layout, goal x, goal y),
+#  so repeated queries on the same maze and goal skip the BFS. Only the most
+#  recently used MAX_DISTANCE_TABLES grids are kept.
+distance_tables = OrderedDict()
+MAX_DISTANCE_TABLES = 64
+
+# distance grid entry for cells that cannot reach the goal
+UNREACHABLE = -1
+
+def goal_distance_table(maze, goal_x, goal_y):
+    """
+    Returns an array('i') indexed by maze.index(x, y) giving the number of
+    moves a lone robot needs to reach (goal_x, goal_y), or UNREACHABLE if it
+    cannot.
+
+    Built by a breadth-first search outward from the goal over the floor
+    cells, and cached per maze layout and goal.
+    """
+    key = (maze.layout_key(), goal_x, goal_y)
+    table = distance_tables.get(key)
+    if table is not None:
+        distance_tables.move_to_end(key)
+        return table
+
+    table = array("i", [UNREACHABLE]) * (maze.width * maze.height)
+    if maze.is_floor(goal_x, goal_y):
+        table[maze.index(goal_x, goal_y)] = 0
+        frontier = deque([(goal_x, goal_y)])
+        while frontier:
+            x, y = frontier.popleft()
+            distance = table[maze.index(x, y)] + 1
+            for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                if maze.is_floor(nx, ny) and table[maze.index(nx, ny)] == UNREACHABLE:
+                    table[maze.index(nx, ny)] = distance
+                    frontier.append((nx, ny))
+
+    distance_tables[key] = table
+    if len(distance_tables) > MAX_DISTANCE_TABLES:
+        distance_tables.popitem(last=False)
+    return table
+
 class MazeworldProblem:
 
     ## you write the constructor, and whatever methods your astar function needs
@@ -22,6 +71,19 @@ class MazeworldProblem:
         self.goal_locations = goal_locations
         self.start_state = self.create_start_state()
         self.num_robots = max(1, len(maze.robotloc) // 2)  # Ensure at least 1 robot
+        # Per-robot goal distance grids for bfs_distance_heuristic, built on first use
+        self.distance_tables = None
+        # Legal single-robot moves out of each floor cell, as ((x, y), action)
+        #  pairs; each cell's list is built the first time a robot stands there
+        self.neighbours = {}
+        # For each turn, a getter pulling the (x, y) pairs of the robots that
+        #  are not moving out of a state; the two empty slices keep the result
+        #  a tuple of pairs even with one or two robots
+        self.other_robots = [
+            itemgetter(*[slice(i*2 + 1, i*2 + 3) for i in range(self.num_robots) if i != turn],
+                       slice(0, 0), slice(0, 0))
+            for turn in range(self.num_robots)
+        ]
 
     def create_start_state(self):
         """
@@ -50,19 +112,39 @@ class MazeworldProblem:
         next_turn = (current_turn + 1) % self.num_robots
 
         # Only move the robot whose turn it is
-        robot_index = current_turn
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1), (0, 0)]:  # (0, 0) for "stay" action
-            new_x = state[robot_index*2 + 1] + dx
-            new_y = state[robot_index*2 + 2] + dy
-            if self.maze.is_floor(new_x, new_y) and not self.is_occupied(state, new_x, new_y, robot_index):
-                new_state = list(state)
-                new_state[0] = next_turn
-                new_state[robot_index*2 + 1] = new_x
-                new_state[robot_index*2 + 2] = new_y
-                action = self.get_action_name(dx, dy)
-                successors.append((tuple(new_state), action))
+        start = current_turn*2 + 1
+        location = state[start:start + 2]
+        moves = self.neighbours.get(location)
+        if moves is None:
+            moves = self.neighbours_of(*location)
+
+        # Cells held by the other robots
+        occupied = set(self.other_robots[current_turn](state))
+
+        head = (next_turn,) + state[1:start]
+        tail = state[start + 2:]
+        for new_location, action in moves:
+            if new_location not in occupied:
+                successors.append((head + new_location + tail, action))
         return successors
 
+    def neighbours_of(self, x, y):
+        """
+        Builds and caches the list of legal single-robot moves out of (x, y),
+        ignoring other robots, in the order of MOVES.
+
+        Args:
+            x: The x-coordinate of the robot.
+            y: The y-coordinate of the robot.
+
+        Returns:
+            A list of ((new_x, new_y), action) pairs.
+        """
+        moves = [((x + dx, y + dy), self.get_action_name(dx, dy))
+                 for dx, dy in MOVES if self.maze.is_floor(x + dx, y + dy)]
+        self.neighbours[(x, y)] = moves
+        return moves
+
     def get_action_name(self, dx, dy):
         """
         Maps the change in coordinates to a corresponding action name.
@@ -74,16 +156,7 @@ class MazeworldProblem:
         Returns:
             A string representing the action name (e.g., "north", "south", "east", "west", or "stay").
         """
-        if dx == -1 and dy == 0:
-            return "west"
-        elif dx == 1 and dy == 0:
-            return "east"
-        elif dx == 0 and dy == -1:
-            return "south"
-        elif dx == 0 and dy == 1:
-            return "north"
-        else:
-            return "stay"
+        return ACTION_NAMES.get((dx, dy), "stay")
 
     def is_occupied(self, state, x, y, current_robot):
         """
@@ -151,6 +224,33 @@ class MazeworldProblem:
             total_distance += abs(robot_x - goal_x) + abs(robot_y - goal_y)
         return total_distance / self.num_robots
 
+    def bfs_distance_heuristic(self, state):
+        """
+        Sums each robot's exact distance to its goal through the maze, ignoring
+        the other robots. Every move shifts one robot by one cell at cost 1
+        (staying put is free), so the sum is admissible and consistent.
+
+        Args:
+            state: A tuple representing the current state of the robots.
+
+        Returns:
+            The total number of single-robot moves still needed, or infinity
+            if some robot cannot reach its goal.
+        """
+        if self.distance_tables is None:
+            self.distance_tables = [
+                goal_distance_table(self.maze, self.goal_locations[i*2], self.goal_locations[i*2 + 1])
+                for i in range(self.num_robots)
+            ]
+        index = self.maze.index
+        total_distance = 0
+        for i, table in enumerate(self.distance_tables):
+            distance = table[index(state[i*2 + 1], state[i*2 + 2])]
+            if distance == UNREACHABLE:
+                return float("inf")
+            total_distance += distance
+        return total_distance
+
     def null_heuristic(self, state):
         return 0
 
@@ -0,0 +1,109 @@
+# COSC 76 Fall 2024
+# Wesley Tan
+# PA2 Mazeworld
+# PartialObservationProblem.py
+
+from SensorlessProblem import SensorlessProblem
+
+SENSORS = ("bump", "parity")
+
+class PartialObservationProblem(SensorlessProblem):
+    """
+    The blind robot problem with cheap sensors: after each action the robot
+    gets a reading that splits its belief state.
+
+    The sensors are:
+        "bump": whether the action ran into a wall (the robot did not move).
+        "parity": the colour of the robot's cell on a checkerboard, that is
+            (x + y) % 2.
+    An observation is a tuple of readings, one per sensor in the order given.
+
+    Beliefs are bitsets as in SensorlessProblem, and each reading splits one
+    with a mask: a bump separates the cells that could not move (the
+    unmoved part of the update) from those that did, and parity is an AND
+    with the checkerboard. Splitting costs the same few big-int operations
+    whether the belief holds ten cells or thousands.
+    """
+
+    def __init__(self, maze, sensors=SENSORS):
+        """
+        Args:
+            maze (Maze): The maze object representing the environment.
+            sensors (tuple, optional): The sensors the robot has, out of
+                SENSORS. Defaults to all of them.
+        """
+        for sensor in sensors:
+            if sensor not in SENSORS:
+                raise ValueError(f"unknown sensor {sensor!r}")
+        super().__init__(maze)
+        self.sensors = tuple(sensors)
+
+        # the cells with (x + y) even; the padding adds 1 to both x and y,
+        #  which leaves the parity alone
+        width = self.padded_width
+        rows = ("10" * width)[:width], ("01" * width)[:width]
+        digits = "".join(rows[y % 2] for y in range(len(maze.floor) // width))
+        self.even = int(digits[::-1], 2)
+        self.transition = {action: (movable, left, right)
+                           for action, movable, left, right in self.transitions}
+
+    def get_outcomes(self, state):
+        """
+        Get every action's possible observations and the beliefs they leave.
+
+        Args:
+            state (int): The current belief state.
+
+        Returns:
+            list: (action, outcomes) tuples, where outcomes is a list of
+            (observation, belief) tuples with non-empty beliefs. Actions that
+            cannot change the belief are left out.
+        """
+        result = []
+        for action, movable, left, right in self.transitions:
+            outcomes = self.partition(state, movable, left, right)
+            if len(outcomes) > 1 or outcomes[0][1] != state:
+                result.append((action, outcomes))
+        return result
+
+    def observe(self, state, action):
+        """
+        Take action in state and split the resulting belief by observation.
+
+        Returns:
+            list: (observation, belief) tuples with non-empty beliefs.
+        """
+        return self.partition(state, *self.transition[action])
+
+    def partition(self, state, movable, left, right):
+        # the belief after a move, split by each sensor's reading
+        moving = state & movable
+        moved = (moving << left) >> right
+        if "bump" in self.sensors:
+            parts = [((False,), moved), ((True,), state ^ moving)]
+        else:
+            parts = [((), (state ^ moving) | moved)]
+        if "parity" in self.sensors:
+            even = self.even
+            parts = [(observation + (parity,), part)
+                     for observation, belief in parts
+                     for parity, part in ((0, belief & even), (1, belief & ~even))]
+        return [(observation, belief) for observation, belief in parts if belief]
+
+    def __str__(self):
+        return (f"Partially observable blind robot problem: maze size {self.maze.width}x{self.maze.height}, "
+                f"sensors {', '.join(self.sensors)}")
+
+
+## A bit of test code
+
+if __name__ == "__main__":
+    from Maze import Maze
+
+    test_problem = PartialObservationProblem(Maze("maze2.maz"))
+    print(test_problem)
+    print("Initial belief state:", test_problem.state_to_string(test_problem.start_state))
+    for action, outcomes in test_problem.get_outcomes(test_problem.start_state):
+        print(action)
+        for observation, belief in outcomes:
+            print("   ", observation, test_problem.state_to_string(belief))
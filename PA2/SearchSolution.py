@@ -3,17 +3,65 @@
 # PA2 Mazeworld
 # SearchSolution.py
 
+from functools import wraps
+from json import dumps
+from time import perf_counter
+
 class SearchSolution:
     """
     A class to represent the solution of a search problem.
     """
 
+    # Set to True to have the searches record timers and counters in
+    # `metrics`; while False they skip all of that bookkeeping.
+    instrument = False
+
     def __init__(self, problem, search_method):
         self.problem_name = str(problem)
         self.search_method = search_method
         self.path = []
         self.nodes_visited = 0
         self.cost = 0
+        self.stale_pops = 0
+        self.metrics = {}
+
+    def timed(self, function, metric):
+        """
+        Wrap function so that its running time is added to metrics[metric].
+        Returns function unchanged when instrumentation is off.
+        """
+        if not self.instrument:
+            return function
+        metrics = self.metrics
+        metrics.setdefault(metric, 0.0)
+
+        def timed_function(*args):
+            start = perf_counter()
+            result = function(*args)
+            metrics[metric] += perf_counter() - start
+            return result
+        return timed_function
+
+    def record_peak(self, metric, size):
+        if size > self.metrics.get(metric, 0):
+            self.metrics[metric] = size
+
+    def count(self, metric, amount=1):
+        self.metrics[metric] = self.metrics.get(metric, 0) + amount
+
+    def to_dict(self):
+        return {
+            "problem": self.problem_name,
+            "search_method": self.search_method,
+            "nodes_visited": self.nodes_visited,
+            "solution_length": len(self.path),
+            "cost": self.cost,
+            "stale_pops": self.stale_pops,
+            "metrics": dict(self.metrics),
+        }
+
+    def to_json(self):
+        return dumps(self.to_dict())
 
     def __str__(self):
         string = "----\n"
@@ -28,4 +76,23 @@ class SearchSolution:
         else:
             string += f"no solution found after visiting {self.nodes_visited} nodes\n"
 
+        if self.stale_pops:
+            string += f"stale queue entries skipped: {self.stale_pops}\n"
+
         return string
+
+
+def timed_search(search_function):
+    """
+    Decorator for search functions: records the wall time of the whole
+    search in the returned solution's metrics when instrumentation is on.
+    """
+    @wraps(search_function)
+    def wrapper(*args, **kwargs):
+        if not SearchSolution.instrument:
+            return search_function(*args, **kwargs)
+        start = perf_counter()
+        solution = search_function(*args, **kwargs)
+        solution.metrics["wall_time"] = perf_counter() - start
+        return solution
+    return wrapper
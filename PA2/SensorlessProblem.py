@@ -4,11 +4,34 @@
 # SensorlessProblem.py
 
 from Maze import Maze
+from MazeworldProblem import UNREACHABLE
+from array import array
+from collections import OrderedDict, deque
 from time import sleep
 from astar_search import astar_search
-from itertools import combinations, product
+from itertools import product
+
+# translation table from maze.floor flags to binary digits
+BIT_TABLE = bytes.maketrans(b"\x00\x01", b"01")
+
+# how many rows of maze distances a problem keeps
+MAX_DISTANCE_ROWS = 64
+
+# the actions, each with the rows and columns it moves the robot by
+ACTIONS = (("north", 1, 0), ("south", -1, 0), ("east", 0, 1), ("west", 0, -1))
 
 class SensorlessProblem:
+    """
+    Blind robot localisation as a search over belief states.
+
+    A belief state is the set of cells the robot might be on, stored as a
+    Python int used as a bitset: bit maze.cell(x, y) is set when the robot
+    may be at (x, y). Hashing and comparing beliefs are then integer
+    operations, and an action moves every cell of a belief at once with a
+    mask and a shift. locations() and belief() convert to and from (x, y)
+    cells.
+    """
+
     def __init__(self, maze):
         """
         Initialize the SensorlessProblem.
@@ -18,12 +41,37 @@ class SensorlessProblem:
         
         Initializes:
             self.maze: The maze object.
-            self.start_state: A frozenset of all possible initial locations.
+            self.start_state: The belief holding every floor location.
             self.maze.robotloc: The first location from start_state, or None if empty.
         """
         self.maze = maze
-        self.start_state = frozenset(self.get_all_possible_locations())
-        self.maze.robotloc = next(iter(self.start_state)) if self.start_state else None
+        self.padded_width = maze.padded_width
+
+        # the floor grid read as one binary number, bit i being cell i
+        floor = int(bytes(maze.floor[::-1]).translate(BIT_TABLE), 2)
+
+        # The transition table, built once: for each action, the offset of
+        #  a move in the padded grid and the mask of floor cells whose
+        #  neighbour that way is floor too (the cells that move). A move is
+        #  then a left or right shift of the masked bits, whichever is
+        #  positive, so get_successors need not branch on the direction.
+        width = self.padded_width
+        self.shifts = {}
+        self.movable = {}
+        self.transitions = []
+        for action, rows, columns in ACTIONS:
+            shift = rows * width + columns
+            movable = floor & (floor >> shift if shift > 0 else floor << -shift)
+            self.shifts[action] = shift
+            self.movable[action] = movable
+            self.transitions.append((action, movable, max(shift, 0), max(-shift, 0)))
+
+        self.start_state = floor
+        self.maze.robotloc = next(self.locations(self.start_state), None)
+        # Rows of the all-pairs floor distance table, indexed by source cell,
+        #  each filled in by a BFS the first time it is needed; only the most
+        #  recently used MAX_DISTANCE_ROWS rows are kept
+        self.distance_rows = OrderedDict()
 
     def get_all_possible_locations(self):
         """
@@ -34,24 +82,104 @@ class SensorlessProblem:
         """
         return [(x, y) for x in range(self.maze.width) for y in range(self.maze.height) if self.maze.is_floor(x, y)]
 
+    def belief(self, locations):
+        """
+        Build a belief state from (x, y) locations.
+
+        Args:
+            locations (iterable): The (x, y) locations the robot may be at.
+
+        Returns:
+            int: The belief state.
+        """
+        state = 0
+        for x, y in locations:
+            state |= 1 << self.maze.cell(x, y)
+        return state
+
+    def locations(self, state):
+        """
+        Iterate over the (x, y) locations in a belief state.
+
+        Args:
+            state (int): The belief state.
+
+        Yields:
+            tuple: (x, y) locations, in increasing cell order.
+        """
+        width = self.padded_width
+        for cell in self.cells(state):
+            yield (cell % width - 1, cell // width - 1)
+
+    def cells(self, state):
+        """
+        Iterate over the maze.cell indices in a belief state, in increasing order.
+        """
+        # clearing bits one at a time would copy the whole int for each
+        #  cell; instead find the ones in its binary digits, lowest first
+        digits = bin(state)[:1:-1]
+        cell = digits.find("1")
+        while cell >= 0:
+            yield cell
+            cell = digits.find("1", cell + 1)
+
+    def distances_from(self, source):
+        """
+        Maze distances from one floor cell to every cell, as an array('i')
+        indexed by maze.cell, with UNREACHABLE for cells that cannot be
+        reached. Rows are computed on first use and the most recently used
+        ones kept.
+        """
+        row = self.distance_rows.get(source)
+        if row is not None:
+            self.distance_rows.move_to_end(source)
+            return row
+
+        floor = self.maze.floor
+        width = self.padded_width
+        row = array("i", [UNREACHABLE]) * len(floor)
+        row[source] = 0
+        frontier = deque([source])
+        while frontier:
+            cell = frontier.popleft()
+            distance = row[cell] + 1
+            for neighbour in (cell + 1, cell - 1, cell + width, cell - width):
+                if floor[neighbour] and row[neighbour] == UNREACHABLE:
+                    row[neighbour] = distance
+                    frontier.append(neighbour)
+        self.distance_rows[source] = row
+        if len(self.distance_rows) > MAX_DISTANCE_ROWS:
+            self.distance_rows.popitem(last=False)
+        return row
+
     def get_successors(self, state):
         """
         Get all possible successor states from the current state.
         
         Args:
-            state (frozenset): The current state (set of possible locations).
+            state (int): The current belief state.
         
         Returns:
             list: A list of tuples (new_state, action) representing successors.
         """
         successors = []
-        actions = ['north', 'south', 'east', 'west']
-        for action in actions:
-            new_state = frozenset(self.move(loc, action) for loc in state)
+        for action, movable, left, right in self.transitions:
+            moving = state & movable
+            if not moving:
+                continue
+            new_state = (state ^ moving) | (moving << left) >> right
             if new_state != state:
                 successors.append((new_state, action))
         return successors
 
+    def result(self, state, action):
+        """
+        The belief state after taking action in state.
+        """
+        moving = state & self.movable[action]
+        shift = self.shifts[action]
+        return (state ^ moving) | (moving << shift if shift > 0 else moving >> -shift)
+
     def move(self, loc, action):
         """
         Attempt to move from a given location in a specified direction.
@@ -63,35 +191,75 @@ class SensorlessProblem:
         Returns:
             tuple: The new location after the move, or the original location if the move is invalid.
         """
-        x, y = loc
-        if action == 'north' and self.maze.is_floor(x, y+1):
-            return (x, y+1)
-        elif action == 'south' and self.maze.is_floor(x, y-1):
-            return (x, y-1)
-        elif action == 'east' and self.maze.is_floor(x+1, y):
-            return (x+1, y)
-        elif action == 'west' and self.maze.is_floor(x-1, y):
-            return (x-1, y)
-        return (x, y)  # Stay in place if move is not possible
-    
+        cell = self.maze.cell(*loc)
+        if self.maze.floor[cell + self.shifts[action]]:
+            cell += self.shifts[action]
+        return (cell % self.padded_width - 1, cell // self.padded_width - 1)
+
     def get_transition_cost(self, next_state, current_state):
         # Assuming uniform cost for all moves
         return 1
 
     def goal_test(self, state):
-        return len(state) == 1
+        # exactly one bit set
+        return state != 0 and state & (state - 1) == 0
 
     # Heuristics
     
     def manhattan_heuristic(self, state):
-        if len(state) <= 1:
+        if self.goal_test(state):
+            return 0
+        # Calculate the maximum Manhattan distance between any two points in
+        #  the state. That is the wider of the spreads of x + y and x - y,
+        #  which one pass over the state finds (the padding offsets in the
+        #  cell indices cancel out).
+        width = self.padded_width
+        cells = list(self.cells(state))
+        sums = [cell // width + cell % width for cell in cells]
+        differences = [cell % width - cell // width for cell in cells]
+        return max(max(sums) - min(sums), max(differences) - min(differences))
+
+    def bounding_box_heuristic(self, state):
+        # An action moves the belief's west and east edges, or its north and
+        #  south edges, at most one cell closer together, so the width plus
+        #  height of its bounding box shrinks by at most one per action. That
+        #  is never less than manhattan_heuristic.
+        width = self.padded_width
+        low_row = ((state & -state).bit_length() - 1) // width
+        high_row = (state.bit_length() - 1) // width
+
+        # OR the rows together to find the occupied columns
+        columns = 0
+        rows = state >> (low_row * width)
+        row_mask = (1 << width) - 1
+        for _ in range(high_row - low_row + 1):
+            columns |= rows & row_mask
+            rows >>= width
+        low_column = (columns & -columns).bit_length() - 1
+        high_column = columns.bit_length() - 1
+        return (high_column - low_column) + (high_row - low_row)
+
+    def maze_distance_heuristic(self, state):
+        # Two cells of the belief have to end up on the same cell, and one
+        #  action brings them at most two steps closer through the maze (both
+        #  may move towards each other), so half their maze distance is a
+        #  lower bound. The pair used is found in two linear sweeps: the cell
+        #  farthest from the first cell, then the cell farthest from that.
+        if self.goal_test(state):
             return 0
-        # Calculate the maximum Manhattan distance between any two points in the state
-        return max(abs(x1-x2) + abs(y1-y2) for (x1, y1), (x2, y2) in combinations(state, 2))
+        cells = list(self.cells(state))
+        distances = self.distances_from(cells[0])
+        farthest = max(cells, key=distances.__getitem__)
+        spreads = list(map(self.distances_from(farthest).__getitem__, cells))
+        # cells cut off from each other can never be brought together
+        if UNREACHABLE in spreads:
+            return float("inf")
+        spread = max(spreads)
+        return max((spread + 1) // 2, self.bounding_box_heuristic(state))
 
     def custom_heuristic(self, state):
         # This heuristic estimates the number of moves needed to reduce the state to a single location
-        return len(state) - 1
+        return state.bit_count() - 1
 
     def null_heuristic(self, state):
         return 0
@@ -113,12 +281,13 @@ class SensorlessProblem:
 
         for state in path:
             print(str(self))
-            self.maze.robotloc = []
             # self.maze.robotloc = next(iter(state))
 
             # adapted this slightly to print multiple possible locations
-            for loc in state:
-                self.maze.robotloc.extend([loc[0], loc[1]])
+            robotloc = []
+            for loc in self.locations(state):
+                robotloc.extend([loc[0], loc[1]])
+            self.maze.robotloc = robotloc
             sleep(1)
 
             print(str(self.maze))
@@ -128,12 +297,12 @@ class SensorlessProblem:
         Convert a state to a string representation.
         
         Args:
-            state (frozenset): The state to convert.
+            state (int): The state to convert.
         
         Returns:
             str: A string representation of the state, listing all locations.
         """
-        return ', '.join([f'({x}, {y})' for x, y in state])
+        return ', '.join([f'({x}, {y})' for x, y in self.locations(state)])
 
 # Test code
 if __name__ == "__main__":
@@ -141,22 +310,24 @@ if __name__ == "__main__":
     test_problem = SensorlessProblem(test_maze2)
 
     print("Test case 1: Basic functionality")
-    print("Initial belief state:", test_problem.start_state)
-    print("Number of possible initial locations:", len(test_problem.start_state))
+    print("Initial belief state:", test_problem.state_to_string(test_problem.start_state))
+    print("Number of possible initial locations:", test_problem.start_state.bit_count())
 
     print("\nTest case 2: Successor function")
     successors = test_problem.get_successors(test_problem.start_state)
     print("Number of successors:", len(successors))
-    print("First successor:", successors[0])
+    print("First successor:", test_problem.state_to_string(successors[0][0]), successors[0][1])
 
     print("\nTest case 3: Goal test")
     print("Is initial state a goal?", test_problem.goal_test(test_problem.start_state))
-    single_location = frozenset([(1, 1)])
+    single_location = test_problem.belief([(1, 1)])
     print("Is single location a goal?", test_problem.goal_test(single_location))
 
     print("\nTest case 4: Heuristics")
     print("Blind robot heuristic for initial state:", test_problem.manhattan_heuristic(test_problem.start_state))
     print("Custom heuristic for initial state:", test_problem.custom_heuristic(test_problem.start_state))
+    print("Bounding box heuristic for initial state:", test_problem.bounding_box_heuristic(test_problem.start_state))
+    print("Maze distance heuristic for initial state:", test_problem.maze_distance_heuristic(test_problem.start_state))
     print("Null heuristic for initial state:", test_problem.null_heuristic(test_problem.start_state))
 
     print("\nTest case 5: A* search")
@@ -0,0 +1,128 @@
+# COSC 76 Fall 2024
+# Wesley Tan
+# PA2 Mazeworld
+# SpaceTimeProblem.py
+
+from MazeworldProblem import MazeworldProblem
+
+# Cost of ending a turn in a cell that one other robot would like; small
+#  enough that the penalties along a whole plan never add up to one move
+AVOID_COST = 1e-6
+
+class SpaceTimeProblem(MazeworldProblem):
+    """
+    A MazeworldProblem whose robots must stay out of cells reserved by
+    others at given times, for planning around existing plans.
+
+    Time is counted in rounds, a round being one turn for every robot; time
+    t is the start of round t, and the round is appended to the state:
+    (turn, x0, y0, ..., round). blocked[t] is the set of (x, y) cells the
+    robots may not be in at time t; the last set also applies to every later
+    time, so rounds past it are all stored as len(blocked) - 1 and the state
+    space stays finite.
+
+    Staying put is free in MazeworldProblem; stay_cost can make it cost as
+    much as a move, so that the cheapest plan is also the earliest to finish.
+
+    Among plans of equal cost, avoid picks the ones that get in other
+    robots' way least: avoid[t] maps cells to how many other robots would
+    like them at time t, and each of those adds AVOID_COST to the cost of a
+    turn ending there.
+    """
+
+    def __init__(self, maze, goal_locations, blocked, stay_cost=0, avoid=None):
+        """
+        Args:
+            maze: The maze, with only the robots being planned on it.
+            goal_locations: A tuple containing the goal locations for the robots.
+            blocked: A non-empty list of sets of reserved (x, y) cells, one per time.
+            stay_cost: The cost of a turn spent in place. Defaults to 0.
+            avoid: A list of dicts from (x, y) cells to robot counts, one per
+                time and no longer than blocked; the last dict also applies
+                to later times. Defaults to None.
+        """
+        self.blocked = blocked
+        self.stay_cost = stay_cost
+        self.avoid = avoid
+        self.horizon = len(blocked) - 1
+        # blocked_after[t] holds every cell reserved at time t or later;
+        #  robots can only stop for good outside these
+        self.blocked_after = [None] * len(blocked)
+        later = set()
+        for step in range(self.horizon, -1, -1):
+            later = later | blocked[step]
+            self.blocked_after[step] = later
+        super().__init__(maze, goal_locations)
+
+    def create_start_state(self):
+        return super().create_start_state() + (0,)
+
+    def get_successors(self, state):
+        """
+        Generates the successors of MazeworldProblem.get_successors that keep
+        the moving robot out of reserved cells, with the round advanced after
+        the last robot's turn.
+
+        Args:
+            state: A tuple representing the current state of the robots.
+
+        Returns:
+            A list of tuples, each containing a new state and the action that led to it.
+        """
+        current_turn = state[0]
+        step = state[-1]
+        start = current_turn*2 + 1
+        # the moving robot is still where it was at the start of the round,
+        #  which only needs checking for the start state
+        if state[start:start + 2] in self.blocked[step]:
+            return []
+
+        blocked = self.blocked[min(step + 1, self.horizon)]
+        if current_turn == self.num_robots - 1 and step < self.horizon:
+            step += 1
+        successors = []
+        for successor, action in super().get_successors(state[:-1]):
+            if successor[start:start + 2] not in blocked:
+                successors.append((successor + (step,), action))
+        return successors
+
+    def goal_test(self, state):
+        # every robot at its goal, and none of those cells needed by anyone
+        #  later; robots before the turn have already reached the next time
+        if state[1:-1] != self.goal_locations:
+            return False
+        current_turn = state[0]
+        step = state[-1]
+        for i in range(self.num_robots):
+            time = min(step + 1, self.horizon) if i < current_turn else step
+            if state[i*2 + 1:i*2 + 3] in self.blocked_after[time]:
+                return False
+        return True
+
+    def get_transition_cost(self, next_state, current_state):
+        cost = self.stay_cost if next_state[1:-1] == current_state[1:-1] else 1
+        if self.avoid is not None:
+            start = current_state[0]*2 + 1
+            avoid = self.avoid[min(current_state[-1] + 1, len(self.avoid) - 1)]
+            cost += AVOID_COST * avoid.get(next_state[start:start + 2], 0)
+        return cost
+
+    def __str__(self):
+        return (f"Space-time Mazeworld problem: {self.num_robots} robots, Goal: {self.goal_locations}, "
+                f"{self.horizon + 1} rounds reserved\n{self.maze}")
+
+
+## A bit of test code to verify that things work as expected.
+
+if __name__ == "__main__":
+    from Maze import Maze
+    from astar_search import astar_search
+
+    # A robot crossing maze_swap while another is parked on its shortest
+    #  path until time 3 has to wait or detour
+    test_maze = Maze("maze_swap.maz").with_robots([1, 1])
+    blocked = [{(2, 1)}, {(2, 1)}, {(2, 1)}, {(2, 1)}, set()]
+    problem = SpaceTimeProblem(test_maze, (3, 1), blocked)
+    print("Start state:", problem.start_state)
+    print("Successors of start state:", problem.get_successors(problem.start_state))
+    print(astar_search(problem, problem.bfs_distance_heuristic))
@@ -0,0 +1,158 @@
+# COSC 76 Fall 2024
+# Wesley Tan
+# PA2 Mazeworld
+# and_or_search.py
+
+# AND-OR search for blind robots with sensors (PartialObservationProblem).
+#
+# With observations a plan can no longer be a fixed list of actions: what
+# the robot does next depends on what it has sensed. A plan is either []
+# (the belief is localised) or a pair (action, branches), where branches
+# maps each observation the action can give to the plan for the belief
+# that observation leaves. Choosing the action is an OR node, and every
+# observation then has to be planned for, an AND node.
+#
+# The search is a depth-first AND-OR search run with iterative deepening on
+# the plan depth (the most actions the robot can end up taking), so the
+# plan found needs as few actions as possible in the worst case, and beliefs
+# reached again along a branch cannot loop. Sub-beliefs are memoised across
+# the whole search: the best plan found for a belief, and the largest depth
+# at which a belief is known to have no plan. The heuristic prunes beliefs
+# that cannot be localised within the remaining depth, if one is given.
+
+from SearchSolution import SearchSolution, timed_search
+
+
+@timed_search
+def and_or_search(search_problem, heuristic_fn=None, depth_limit=100):
+    """
+    Find a conditional plan that localises a robot with sensors.
+
+    Args:
+        search_problem (PartialObservationProblem): The problem to solve.
+        heuristic_fn (optional): A lower bound on the depth of a plan from
+            a belief, to prune with. Defaults to None (no pruning). The
+            sensorless heuristics are not lower bounds here: one action's
+            readings can split a wide belief into single cells.
+        depth_limit (int, optional): The deepest plan to look for. Defaults to 100.
+
+    Returns:
+        SearchSolution: solution.plan is the conditional plan, or None, and
+        solution.cost its depth. The path is the beliefs along its deepest
+        branch. nodes_visited counts OR nodes expanded.
+    """
+    solution = SearchSolution(search_problem, "AND-OR search")
+    solution.plan = None
+    goal_test = solution.timed(search_problem.goal_test, "goal_test_time")
+    get_outcomes = solution.timed(search_problem.get_outcomes, "successor_time")
+
+    # solved[belief] is (depth, plan) for the shallowest plan found so far,
+    #  where depth is the most actions the plan can take; failed[belief] is
+    #  a depth known to be too small for any plan
+    solved = {}
+    failed = {}
+
+    def depth_of(state):
+        return solved[state][0] if state in solved else 0
+
+    def or_search(state, depth):
+        if goal_test(state):
+            return []
+        known = solved.get(state)
+        if known is not None and known[0] <= depth:
+            return known[1]
+        if depth == 0 or failed.get(state, -1) >= depth:
+            return None
+        if heuristic_fn is not None and heuristic_fn(state) > depth:
+            return None
+
+        # any plan found from here is shallower than the one known
+        solution.nodes_visited += 1
+        for action, outcomes in get_outcomes(state):
+            branches = and_search(outcomes, depth - 1)
+            if branches is not None:
+                plan = (action, branches)
+                solved[state] = (1 + max(depth_of(belief) for observation, belief in outcomes), plan)
+                return plan
+        failed[state] = depth
+        return None
+
+    def and_search(outcomes, depth):
+        branches = {}
+        for observation, belief in outcomes:
+            plan = or_search(belief, depth)
+            if plan is None:
+                return None
+            branches[observation] = plan
+        return branches
+
+    for depth in range(depth_limit + 1):
+        plan = or_search(search_problem.start_state, depth)
+        if plan is not None:
+            solution.plan = plan
+            solution.cost = depth
+            break
+    if solution.instrument:
+        solution.record_peak("peak_visited", len(solved) + len(failed))
+
+    if solution.plan is not None:
+        # the beliefs along the deepest branch
+        state = search_problem.start_state
+        plan = solution.plan
+        solution.path = [state]
+        while plan:
+            action, branches = plan
+            observation, state = max(search_problem.observe(state, action),
+                                     key=lambda outcome: depth_of(outcome[1]))
+            plan = branches[observation]
+            solution.path.append(state)
+    return solution
+
+
+def execute_plan(search_problem, plan, location):
+    """
+    Play a conditional plan out for a robot really at location, sensing as
+    it goes. Returns the actions taken and the location the robot ends at.
+    """
+    state = search_problem.belief([location])
+    actions = []
+    while plan:
+        action, branches = plan
+        # a robot that knows where it is gets exactly one reading
+        (observation, state), = search_problem.observe(state, action)
+        actions.append(action)
+        plan = branches[observation]
+    return actions, next(search_problem.locations(state))
+
+
+# Some test code
+
+if __name__ == "__main__":
+    from Maze import Maze
+    from PartialObservationProblem import PartialObservationProblem
+    from SensorlessProblem import SensorlessProblem
+    from astar_search import astar_search
+
+    for maze_file in ("maze2.maz", "maze3.maz", "maze_warehouse.maz"):
+        maze = Maze(maze_file)
+        if maze_file != "maze_warehouse.maz":
+            blind = SensorlessProblem(maze)
+            print(astar_search(blind, blind.bounding_box_heuristic))
+
+        sensor_sets = (("bump",), ("parity",), ("bump", "parity"))
+        if maze_file == "maze_warehouse.maz":
+            # one sensor at a time takes a while here
+            sensor_sets = sensor_sets[-1:]
+        for sensors in sensor_sets:
+            problem = PartialObservationProblem(maze, sensors)
+            result = and_or_search(problem)
+            print(f"{problem}: worst case {result.cost} actions, {result.nodes_visited} nodes visited")
+
+        # wherever the robot really starts, the plan localises it within
+        #  the worst case, at the cell its moves really take it to
+        for location in problem.locations(problem.start_state):
+            actions, end = execute_plan(problem, result.plan, location)
+            for action in actions:
+                location = problem.move(location, action)
+            assert end == location and len(actions) <= result.cost
+        print("plan for", maze_file, "from (1, 1):", execute_plan(problem, result.plan, (1, 1)))
@@ -3,13 +3,19 @@
 # PA2 Mazeworld
 # astar_search.py
 
-from SearchSolution import SearchSolution
+from SearchSolution import SearchSolution, timed_search
+from collections import OrderedDict
 from heapq import heappush, heappop
+from itertools import count
+
+INFINITY = float("inf")
 
 class AstarNode:
     # each search node except the root has a parent node
     # and all search nodes wrap a state object
 
+    __slots__ = ("state", "heuristic", "parent", "transition_cost")
+
     def __init__(self, state, heuristic, parent=None, transition_cost=0):
         self.state = state
         self.heuristic = heuristic
@@ -19,12 +25,45 @@ class AstarNode:
     def priority(self):
         return self.transition_cost + self.heuristic
 
-    # comparison operator,
-    # needed for heappush and heappop to work with AstarNodes:
+    # comparison operator, for putting AstarNodes directly in a heap;
+    # astar_search itself orders its heap by tuple keys instead:
     def __lt__(self, other):
         return self.priority() < other.priority()
 
 
+class HeuristicCache:
+    """
+    Bounded LRU cache of heuristic values, keyed by state.
+
+    A cache belongs to one heuristic function. Keep the same object across
+    searches on the same problem so repeated queries reuse earlier values.
+    """
+
+    def __init__(self, heuristic_fn, max_size=100000):
+        self.heuristic_fn = heuristic_fn
+        self.max_size = max_size
+        self.values = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, state):
+        values = self.values
+        value = values.get(state)
+        if value is not None:
+            self.hits += 1
+            values.move_to_end(state)
+            return value
+        self.misses += 1
+        value = self.heuristic_fn(state)
+        values[state] = value
+        if len(values) > self.max_size:
+            values.popitem(last=False)
+        return value
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.values)}
+
+
 # take the current node, and follow its parents back
 #  as far as possible. Grab the states from the nodes,
 #  and reverse the resulting list of states.
@@ -38,33 +77,99 @@ def backchain(node):
     result.reverse()
     return result
 
-def astar_search(search_problem, heuristic_fn):
+@timed_search
+def astar_search(search_problem, heuristic_fn, consistent=False, heuristic_cache=None, cost_limit=None):
+    """
+    A* search with lazy deletion.
+
+    Heap entries are (f, -g, tiebreak, node) tuples, so heap comparisons run
+    on numbers in C rather than calling AstarNode.__lt__. Ties on f go to the
+    entry with the larger g (the one closer to a goal), then to the entry
+    pushed first, which makes the search deterministic.
+
+    When a cheaper path to a state is found, the old heap entry is left in
+    place; on pop it is recognised as stale because its cost no longer matches
+    visited_cost, and it is skipped without counting as a visit. With a
+    consistent heuristic the first expansion of a state is optimal, so
+    consistent=True also keeps a closed set and never reopens a state.
+
+    States whose heuristic is infinite cannot reach a goal and are never
+    pushed, so a problem with no solution fails as soon as its reachable
+    states with a finite heuristic run out.
+
+    Args:
+        search_problem: The problem to solve.
+        heuristic_fn: Function estimating the cost from a state to the goal.
+        consistent (bool, optional): Whether heuristic_fn is consistent. Defaults to False.
+        heuristic_cache (HeuristicCache, optional): Cache built for heuristic_fn
+            to look values up in. Defaults to None.
+        cost_limit (optional): Never push nodes whose f exceeds this, so the
+            search gives up on paths costing more. Defaults to None (no limit).
+
+    Returns:
+        SearchSolution: The solution path, its cost and search statistics,
+        including the number of stale heap entries skipped.
+    """
+    solution = SearchSolution(search_problem, "Astar with heuristic " + heuristic_fn.__name__)
+    if heuristic_cache is not None:
+        if heuristic_cache.heuristic_fn != heuristic_fn:
+            raise ValueError("heuristic_cache was built for a different heuristic")
+        heuristic_fn = heuristic_cache
+
     # I'll get you started:
     start_node = AstarNode(search_problem.start_state, heuristic_fn(search_problem.start_state))
+    # an infinite heuristic marks a state the goal cannot be reached from
+    if start_node.heuristic == INFINITY:
+        return solution
+    tiebreak = count()
     pqueue = []
-    heappush(pqueue, start_node)
+    heappush(pqueue, (start_node.heuristic, 0, next(tiebreak), start_node))
 
-    solution = SearchSolution(search_problem, "Astar with heuristic " + heuristic_fn.__name__)
+    instrument = solution.instrument
+    goal_test = solution.timed(search_problem.goal_test, "goal_test_time")
+    get_successors = solution.timed(search_problem.get_successors, "successor_time")
 
     visited_cost = {}
     visited_cost[start_node.state] = 0
+    closed = set()
 
     while pqueue:
-        current_node = heappop(pqueue)
+        current_node = heappop(pqueue)[3]
+        current_state = current_node.state
+
+        # Lazy deletion: a cheaper entry for this state was pushed after this one
+        if current_node.transition_cost > visited_cost[current_state] or current_state in closed:
+            solution.stale_pops += 1
+            continue
+        if consistent:
+            closed.add(current_state)
         solution.nodes_visited += 1
 
-        if search_problem.goal_test(current_node.state):
+        if goal_test(current_state):
             solution.path = backchain(current_node)
             solution.cost = current_node.transition_cost
             return solution
 
-        successors = search_problem.get_successors(current_node.state)
+        successors = get_successors(current_state)
         for successor_state, action in successors:
-            successor_cost = current_node.transition_cost + search_problem.get_transition_cost(successor_state, current_node.state)
-            
+            if successor_state in closed:
+                if instrument:
+                    solution.count("duplicates_pruned")
+                continue
+            successor_cost = current_node.transition_cost + search_problem.get_transition_cost(successor_state, current_state)
+
             if successor_state not in visited_cost or successor_cost < visited_cost[successor_state]:
                 visited_cost[successor_state] = successor_cost
                 successor_node = AstarNode(successor_state, heuristic_fn(successor_state), current_node, successor_cost)
-                heappush(pqueue, successor_node)
+                priority = successor_cost + successor_node.heuristic
+                if priority == INFINITY or (cost_limit is not None and priority > cost_limit):
+                    continue
+                heappush(pqueue, (priority, -successor_cost, next(tiebreak), successor_node))
+            elif instrument:
+                solution.count("duplicates_pruned")
+
+        if instrument:
+            solution.record_peak("peak_frontier", len(pqueue))
+            solution.record_peak("peak_visited", len(visited_cost))
 
     return solution
@@ -0,0 +1,241 @@
+# COSC 76 Fall 2024
+# Wesley Tan
+# PA2 Mazeworld
+# cbs_search.py
+
+# Conflict-Based Search for multi-robot Mazeworld problems.
+#
+# CBS never searches over more than one robot at a time. The high level is
+# a best-first search over a constraint tree: each node holds, for every
+# robot, a set of (cell, time) pairs it may not occupy, a plan per robot
+# that respects them, and the total cost of those plans (see below). The
+# low level plans a single robot around its constraints with astar_search
+# on a SpaceTimeProblem.
+#
+# Expanding a node plays its plans out in MazeworldProblem order (in each
+# round the robots move one after another, robot 0 first) and finds the
+# earliest conflict. During round t, robot a moving before robot b
+# conflicts with it if a ends the round where b starts it (b has not moved
+# out yet), or where b ends it. Every valid plan avoids one of the two
+# cells, so the node gets two children, each with one robot constrained
+# away from the cell at that time and that robot replanned. Following a
+# robot that has already moved is allowed, exactly as in MazeworldProblem.
+#
+# Staying put is free in MazeworldProblem, which would let CBS put a
+# conflict off for ever at no cost: the constraint tree would never run out
+# of nodes as cheap as the current one. So, as usual for CBS, the plans are
+# costed in time: a robot pays for every round until it reaches its goal for
+# good, whether it moves or waits, and the tree is ordered by the total of
+# these arrival times (the flowtime). The first conflict-free node popped
+# has the smallest flowtime of any valid plan.
+#
+# Robots swapping places in a narrow corridor are a known weak spot: every
+# constraint only pushes a conflict one round later, so the constraint tree
+# grows exponentially before the robots are made to use a side pocket. Once
+# node_limit constraint tree nodes have been expanded, CBS gives up and the
+# problem is handed to independence detection, which searches jointly over
+# just the robots whose plans conflict.
+
+from heapq import heappush, heappop
+from itertools import count
+
+from SearchSolution import SearchSolution, timed_search
+from SpaceTimeProblem import SpaceTimeProblem
+from independence_search import group_locations, independence_search, location_at, merge_plans, plan_group
+
+
+def plan_robot(maze, goal_locations, robot, constraints, timelines, solution):
+    # plan one robot around its (cell, time) constraints, keeping out of the
+    #  way of the other robots' timelines where that costs nothing; returns
+    #  its timeline and arrival time, or None
+    others = [timeline for other, timeline in enumerate(timelines)
+              if other != robot and timeline is not None]
+    horizon = max((time for cell, time in constraints), default=-1) + 1
+    rounds = max((len(timeline) for timeline in others), default=0)
+
+    # a robot moving into a cell at time t gets in the way of robots there at
+    #  t, and of those leaving it at t - 1
+    avoid = [{} for _ in range(rounds + 1)]
+    for timeline in others:
+        for time, counts in enumerate(avoid):
+            for cell in {location_at(timeline, max(time - 1, 0)), location_at(timeline, time)}:
+                counts[cell] = counts.get(cell, 0) + 1
+
+    blocked = [set() for _ in range(max(horizon, rounds) + 1)]
+    for cell, time in constraints:
+        blocked[time].add(cell)
+    problem = SpaceTimeProblem(maze.with_robots(group_locations(maze.robotloc, (robot,))),
+                               tuple(group_locations(goal_locations, (robot,))), blocked,
+                               stay_cost=1, avoid=avoid)
+
+    low_level_nodes = solution.nodes_visited
+    plan = plan_group(problem, solution)
+    solution.low_level_nodes += solution.nodes_visited - low_level_nodes
+    if plan is None:
+        return None
+    (timeline,), cost = plan
+    return timeline, len(timeline) - 1
+
+
+def find_conflicts(timelines):
+    # yields the conflicts in time order, each as two (robot, cell, time)
+    #  constraints one of which every valid plan must meet
+    rounds = max(len(timeline) for timeline in timelines)
+    for step in range(rounds - 1):
+        starts = {}
+        for robot, timeline in enumerate(timelines):
+            starts[location_at(timeline, step)] = robot
+        ends = {}
+        for robot, timeline in enumerate(timelines):
+            end = location_at(timeline, step + 1)
+            other = ends.get(end)
+            if other is not None:
+                yield (other, end, step + 1), (robot, end, step + 1)
+            ends[end] = robot
+            # robots after this one have not moved yet this round
+            other = starts.get(end)
+            if other is not None and other > robot:
+                yield (robot, end, step + 1), (other, end, step)
+
+
+def path_flowtime(path, num_robots):
+    # the total over the robots of the round after their last move, for a
+    #  MazeworldProblem path taking turns from robot 0
+    arrivals = [0] * num_robots
+    for step, (state, next_state) in enumerate(zip(path, path[1:])):
+        robot = state[0]
+        if next_state[robot*2 + 1:robot*2 + 3] != state[robot*2 + 1:robot*2 + 3]:
+            arrivals[robot] = step // num_robots + 1
+    return sum(arrivals)
+
+
+@timed_search
+def cbs_search(search_problem, node_limit=1000):
+    """
+    Plan a multi-robot MazeworldProblem with Conflict-Based Search.
+
+    The constraint tree has no natural bottom when the robots cannot all
+    reach their goals together, and grows exponentially on some small
+    problems (see above), so node_limit bounds the number of constraint
+    tree nodes expanded. When it is reached, the problem is solved with
+    independence_search instead.
+
+    Args:
+        search_problem: A MazeworldProblem.
+        node_limit (int, optional): Hand over to independence_search after
+            expanding this many constraint tree nodes; None never does.
+            Defaults to 1000.
+
+    Returns:
+        SearchSolution: A path of search_problem states, one per turn, that
+        search_problem.animate_path can play back, and its cost as a
+        MazeworldProblem path. solution.flowtime is the total arrival time
+        that CBS minimised. nodes_visited totals the single-robot searches;
+        solution.high_level_nodes and solution.low_level_nodes count
+        constraint tree nodes expanded and single-robot nodes visited.
+        After a hand-over, solution.fallback is True, nodes_visited also
+        counts independence_search's nodes, and the path minimises cost
+        rather than flowtime.
+    """
+    solution = SearchSolution(search_problem, "Conflict-Based Search")
+    solution.high_level_nodes = 0
+    solution.low_level_nodes = 0
+    solution.flowtime = 0
+    solution.fallback = False
+    maze = search_problem.maze
+    goal_locations = search_problem.goal_locations
+    num_robots = search_problem.num_robots
+
+    constraints = [frozenset()] * num_robots
+    timelines = [None] * num_robots
+    costs = [0] * num_robots
+    for robot in range(num_robots):
+        plan = plan_robot(maze, goal_locations, robot, constraints[robot], timelines, solution)
+        if plan is None:
+            return solution
+        timelines[robot], costs[robot] = plan
+
+    # constraint tree nodes are (constraints, timelines, arrival times),
+    #  ordered by flowtime and then by age
+    tiebreak = count()
+    conflicts = list(find_conflicts(timelines))
+    pqueue = [(sum(costs), len(conflicts), next(tiebreak), (constraints, timelines, costs, conflicts))]
+
+    while pqueue:
+        flowtime, _, _, (constraints, timelines, costs, conflicts) = heappop(pqueue)
+        solution.high_level_nodes += 1
+
+        if not conflicts:
+            solution.path = merge_plans(timelines)
+            solution.cost = sum(search_problem.get_transition_cost(next_state, state)
+                                for state, next_state in zip(solution.path, solution.path[1:]))
+            solution.flowtime = flowtime
+            return solution
+        if node_limit is not None and solution.high_level_nodes >= node_limit:
+            fallback = independence_search(search_problem)
+            solution.fallback = True
+            solution.nodes_visited += fallback.nodes_visited
+            solution.path = fallback.path
+            solution.cost = fallback.cost
+            if fallback.path:
+                solution.flowtime = path_flowtime(fallback.path, num_robots)
+            if solution.instrument:
+                solution.count("fallbacks")
+            return solution
+        if solution.instrument:
+            solution.record_peak("peak_frontier", len(pqueue))
+
+        children = []
+        for robot, cell, time in conflicts[0]:
+            if (cell, time) in constraints[robot]:
+                continue
+            child_constraints = list(constraints)
+            child_constraints[robot] = constraints[robot] | {(cell, time)}
+            plan = plan_robot(maze, goal_locations, robot, child_constraints[robot], timelines, solution)
+            if plan is None:
+                continue
+            child_timelines = list(timelines)
+            child_costs = list(costs)
+            child_timelines[robot], child_costs[robot] = plan
+            child_conflicts = list(find_conflicts(child_timelines))
+
+            # bypass: a child's plan that costs no more and conflicts less
+            #  also meets this node's constraints, so take it instead of
+            #  splitting here
+            if child_costs[robot] == costs[robot] and len(child_conflicts) < len(conflicts):
+                children = [(constraints, child_timelines, child_costs, child_conflicts)]
+                break
+            children.append((child_constraints, child_timelines, child_costs, child_conflicts))
+
+        for child in children:
+            heappush(pqueue, (sum(child[2]), len(child[3]), next(tiebreak), child))
+
+    return solution
+
+
+# Some test code
+
+if __name__ == "__main__":
+    from Maze import Maze
+    from MazeworldProblem import MazeworldProblem
+    from astar_search import astar_search
+
+    # Two robots swapping places in a corridor
+    test_maze = Maze("maze3.maz").with_robots([1, 0, 1, 1])
+    problem = MazeworldProblem(test_maze, (1, 1, 1, 0))
+    print(astar_search(problem, problem.bfs_distance_heuristic))
+    result = cbs_search(problem)
+    print(result)
+    print(f"flowtime {result.flowtime}, high-level nodes {result.high_level_nodes}, "
+          f"low-level nodes {result.low_level_nodes}")
+    problem.animate_path(result.path)
+
+    # Twelve robots crossing the warehouse to the far wall
+    warehouse = Maze("maze_warehouse.maz")
+    goals = []
+    for y in range(1, 13):
+        goals.extend((22, y))
+    problem = MazeworldProblem(warehouse, tuple(goals))
+    result = cbs_search(problem, node_limit=5000)
+    print(f"{problem.num_robots} robots, cost {result.cost}, flowtime {result.flowtime}, "
+          f"high-level nodes {result.high_level_nodes}, low-level nodes {result.low_level_nodes}")
@@ -0,0 +1,225 @@
+# COSC 76 Fall 2024
+# Wesley Tan
+# PA2 Mazeworld
+# independence_search.py
+
+# Multi-robot planning with independence detection.
+#
+# MazeworldProblem already decomposes each joint step into one move per robot
+# (the turn in the state), so A* branches five ways per ply instead of 5^k
+# ways like SimultaneousProblem; but it still searches over the positions of
+# all k robots at once. Independence detection only searches jointly over
+# robots that actually get in each other's way:
+#   - every robot is planned on its own;
+#   - the plans are played out together one round (a turn for every robot)
+#     at a time, and checked for conflicts;
+#   - when two groups conflict, each in turn is replanned around every other
+#     group's plan at no extra cost, as a SpaceTimeProblem;
+#   - if neither can be, the two groups are merged and replanned as one
+#     MazeworldProblem;
+#   - this repeats until no two plans conflict.
+# Every sub-search is astar_search over just one group's robots.
+#
+# Robots of different groups conflict in a round when one of them starts or
+# ends it in a cell the other starts or ends it in. Plans without conflicts
+# never share a cell within a round, so their turns can be interleaved in
+# robot order, and the result is a path of the full MazeworldProblem. Moves
+# cost 1 and staying is free, so its cost is the sum of the group costs, and
+# since no joint plan can do better for any group than that group's own
+# optimal plan, the combined path is optimal too.
+
+from MazeworldProblem import MazeworldProblem
+from SearchSolution import SearchSolution, timed_search
+from SpaceTimeProblem import SpaceTimeProblem
+from astar_search import astar_search
+
+
+def group_locations(locations, group):
+    # the coordinates of the robots in group, out of a flat coordinate list
+    return [c for robot in group for c in locations[robot*2:robot*2 + 2]]
+
+
+def plan_group(problem, solution, cost_limit=None):
+    # solve one group's problem; returns each robot's location at the end of
+    #  every round and the plan cost, or None if there is no plan (within
+    #  cost_limit)
+    result = astar_search(problem, problem.bfs_distance_heuristic,
+                          consistent=True, cost_limit=cost_limit)
+    solution.nodes_visited += result.nodes_visited
+    solution.stale_pops += result.stale_pops
+    if not result.path:
+        return None
+
+    # path[j] is taken at turn j % num_robots, so every num_robots-th state
+    #  ends a round; the goal may be reached part way through the last one
+    num_robots = problem.num_robots
+    rounds = result.path[::num_robots]
+    if (len(result.path) - 1) % num_robots:
+        rounds.append(result.path[-1])
+    timelines = [[state[i*2 + 1:i*2 + 3] for state in rounds] for i in range(num_robots)]
+    return timelines, result.cost
+
+
+def location_at(timeline, step):
+    # robots stay at their goal once their plan has run out
+    return timeline[min(step, len(timeline) - 1)]
+
+
+def reserved_cells(timelines, robots):
+    # the cells a SpaceTimeProblem must keep out of at each time to avoid
+    #  the given robots: a robot holds its cells at times t and t + 1 for the
+    #  whole of round t, so it reserves its cells at t - 1, t and t + 1
+    rounds = max(len(timelines[robot]) for robot in robots)
+    blocked = []
+    for step in range(rounds + 1):
+        cells = set()
+        for robot in robots:
+            for time in range(max(step - 1, 0), step + 2):
+                cells.add(location_at(timelines[robot], time))
+        blocked.append(cells)
+    return blocked
+
+
+def find_conflict(timelines, group_of):
+    # returns the first pair of robots from different groups that share a
+    #  cell within a round, or None
+    rounds = max(len(timeline) for timeline in timelines)
+    for step in range(rounds):
+        claimed = {}
+        for robot, timeline in enumerate(timelines):
+            before = location_at(timeline, step)
+            after = location_at(timeline, step + 1)
+            for location in (before, after) if before != after else (before,):
+                claimants = claimed.setdefault(location, [])
+                for other in claimants:
+                    if group_of[other] != group_of[robot]:
+                        return other, robot
+                claimants.append(robot)
+    return None
+
+
+def merge_plans(timelines):
+    # interleave the robots' rounds into MazeworldProblem states, one turn
+    #  (a move or a stay) per state, in robot order
+    num_robots = len(timelines)
+    state = [0]
+    for timeline in timelines:
+        state.extend(timeline[0])
+    path = [tuple(state)]
+
+    rounds = max(len(timeline) for timeline in timelines)
+    for step in range(1, rounds):
+        for robot, timeline in enumerate(timelines):
+            state[0] = (robot + 1) % num_robots
+            state[robot*2 + 1:robot*2 + 3] = location_at(timeline, step)
+            path.append(tuple(state))
+    return path
+
+
+@timed_search
+def independence_search(search_problem):
+    """
+    Plan a multi-robot MazeworldProblem by planning robots independently and
+    only searching jointly over groups whose plans conflict.
+
+    Args:
+        search_problem: A MazeworldProblem.
+
+    Returns:
+        SearchSolution: A path of search_problem states, with nodes_visited
+        totalled over all the group searches. solution.groups lists the
+        final groups of robot indices.
+    """
+    solution = SearchSolution(search_problem, "Independence detection")
+    solution.groups = []
+    maze = search_problem.maze
+    goal_locations = search_problem.goal_locations
+    num_robots = search_problem.num_robots
+
+    def group_problem(group):
+        return MazeworldProblem(maze.with_robots(group_locations(maze.robotloc, group)),
+                                tuple(group_locations(goal_locations, group)))
+
+    # group_of[robot] is the tuple of robots planned together with robot
+    group_of = [(robot,) for robot in range(num_robots)]
+    plans = {}
+    for group in group_of:
+        plans[group] = plan_group(group_problem(group), solution)
+        if plans[group] is None:
+            return solution
+
+    while True:
+        timelines = [None] * num_robots
+        for group, (group_timelines, cost) in plans.items():
+            for robot, timeline in zip(group, group_timelines):
+                timelines[robot] = timeline
+
+        conflict = find_conflict(timelines, group_of)
+        if conflict is None:
+            break
+
+        # try to move either group out of everyone else's way at the same cost
+        first, second = conflict
+        for group in (group_of[first], group_of[second]):
+            others = [robot for robot in range(num_robots) if group_of[robot] != group]
+            problem = SpaceTimeProblem(maze.with_robots(group_locations(maze.robotloc, group)),
+                                       tuple(group_locations(goal_locations, group)),
+                                       reserved_cells(timelines, others))
+            plan = plan_group(problem, solution, cost_limit=plans[group][1])
+            if plan is not None:
+                plans[group] = plan
+                if solution.instrument:
+                    solution.count("replans")
+                break
+        else:
+            merged = tuple(sorted(group_of[first] + group_of[second]))
+            del plans[group_of[first]]
+            del plans[group_of[second]]
+            if solution.instrument:
+                solution.count("merges")
+
+            # the robots of a group with no joint plan cannot all reach their
+            #  goals even ignoring everyone else, so neither can the full problem
+            plans[merged] = plan_group(group_problem(merged), solution)
+            if plans[merged] is None:
+                return solution
+            for robot in merged:
+                group_of[robot] = merged
+
+    solution.path = merge_plans(timelines)
+    solution.cost = sum(cost for group_timelines, cost in plans.values())
+    solution.groups = sorted(plans)
+    return solution
+
+
+# Some test code
+
+if __name__ == "__main__":
+    from Maze import Maze
+
+    # Two robots whose shortest paths never meet stay in separate groups
+    test_maze = Maze("maze_swap.maz")
+    problem = MazeworldProblem(test_maze, (3, 1, 1, 3))
+    print(astar_search(problem, problem.bfs_distance_heuristic))
+    result = independence_search(problem)
+    print(result)
+    print("groups:", result.groups)
+
+    # Two robots swapping places in a corridor have to be planned together
+    test_maze = Maze("maze3.maz").with_robots([1, 0, 1, 1])
+    problem = MazeworldProblem(test_maze, (1, 1, 1, 0))
+    result = independence_search(problem)
+    print(result)
+    print("groups:", result.groups)
+
+    # Twelve robots crossing a warehouse to the far wall in reverse order, so
+    #  that every path crosses every other; far beyond the reach of a joint
+    #  search over all of them
+    warehouse = Maze("maze_warehouse.maz")
+    goals = []
+    for y in range(12, 0, -1):
+        goals.extend((22, y))
+    problem = MazeworldProblem(warehouse, tuple(goals))
+    result = independence_search(problem)
+    print(f"{problem.num_robots} robots, cost {result.cost}, "
+          f"{result.nodes_visited} nodes visited, groups {result.groups}")
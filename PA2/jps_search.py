@@ -0,0 +1,160 @@
+# COSC 76 Fall 2024
+# Wesley Tan
+# PA2 Mazeworld
+# jps_search.py
+
+# Jump Point Search for single-robot Mazeworld queries.
+#
+# Plain A* on an open grid pushes every floor cell along an optimal corridor.
+# JPS instead jumps in a straight line until it reaches a cell where the
+# search might need to turn (the goal, or a cell with a forced neighbour),
+# and only pushes those jump points. On a 4-connected grid:
+#   - a horizontal jump stops where a cell above or below opens up right
+#     after a wall (a forced neighbour);
+#   - a vertical jump stops wherever a horizontal jump from it would stop.
+# The path between jump points is straight, so it is expanded back into
+# unit moves at the end and the solution looks exactly like astar_search's.
+
+from SearchSolution import SearchSolution, timed_search
+from heapq import heappush, heappop
+from itertools import count
+
+
+def horizontal_jump(floor, width, cell, step, goal):
+    # walk along a row from cell until hitting a wall, the goal, or a
+    #  forced neighbour; returns the jump point or None
+    while True:
+        cell += step
+        if not floor[cell]:
+            return None
+        if cell == goal:
+            return cell
+        if (floor[cell + width] and not floor[cell - step + width]) or \
+           (floor[cell - width] and not floor[cell - step - width]):
+            return cell
+
+
+def vertical_jump(floor, width, cell, step, goal):
+    # walk along a column; stop wherever a horizontal jump would find something
+    while True:
+        cell += step
+        if not floor[cell]:
+            return None
+        if cell == goal:
+            return cell
+        if horizontal_jump(floor, width, cell, 1, goal) is not None or \
+           horizontal_jump(floor, width, cell, -1, goal) is not None:
+            return cell
+
+
+@timed_search
+def jps_search(search_problem):
+    """
+    Find a shortest path for a single-robot MazeworldProblem with Jump Point Search.
+
+    Args:
+        search_problem: A MazeworldProblem with exactly one robot.
+
+    Returns:
+        SearchSolution: The path as MazeworldProblem states, one per unit move,
+        with nodes_visited counting expanded jump points.
+    """
+    if search_problem.num_robots != 1:
+        raise ValueError("jps_search only handles single-robot problems")
+
+    solution = SearchSolution(search_problem, "Jump Point Search")
+    maze = search_problem.maze
+    floor = maze.floor
+    width = maze.padded_width
+
+    start_x, start_y = search_problem.start_state[1], search_problem.start_state[2]
+    goal_x, goal_y = search_problem.goal_locations[0], search_problem.goal_locations[1]
+    if not maze.is_floor(start_x, start_y) or not maze.is_floor(goal_x, goal_y):
+        return solution
+    start = maze.cell(start_x, start_y)
+    goal = maze.cell(goal_x, goal_y)
+
+    def heuristic(cell):
+        return abs(cell % width - goal % width) + abs(cell // width - goal // width)
+
+    # parent jump point and arrival direction of every reached jump point
+    parents = {start: None}
+    directions = {start: 0}
+    costs = {start: 0}
+    tiebreak = count()
+    pqueue = [(heuristic(start), 0, next(tiebreak), start)]
+
+    while pqueue:
+        f, negative_cost, _, cell = heappop(pqueue)
+        cost = -negative_cost
+        if cost > costs[cell]:
+            solution.stale_pops += 1
+            continue
+        solution.nodes_visited += 1
+
+        if cell == goal:
+            solution.path = expand_path(maze, parents, goal)
+            solution.cost = cost
+            return solution
+
+        # every direction except straight back the way we came
+        for step in (1, -1, width, -width):
+            if step == -directions[cell]:
+                continue
+            if step in (1, -1):
+                jump_point = horizontal_jump(floor, width, cell, step, goal)
+            else:
+                jump_point = vertical_jump(floor, width, cell, step, goal)
+            if jump_point is None:
+                continue
+
+            distance = abs(jump_point - cell)
+            if step not in (1, -1):
+                distance //= width
+            jump_cost = cost + distance
+            if jump_cost < costs.get(jump_point, float("inf")):
+                costs[jump_point] = jump_cost
+                parents[jump_point] = cell
+                directions[jump_point] = step
+                heappush(pqueue, (jump_cost + heuristic(jump_point), -jump_cost,
+                                  next(tiebreak), jump_point))
+
+    return solution
+
+
+def expand_path(maze, parents, goal):
+    # rebuild the unit-move path by walking the straight segments between
+    #  consecutive jump points, as (turn, x, y) MazeworldProblem states
+    width = maze.padded_width
+    jump_points = []
+    cell = goal
+    while cell is not None:
+        jump_points.append(cell)
+        cell = parents[cell]
+    jump_points.reverse()
+
+    cells = [jump_points[0]]
+    for cell in jump_points[1:]:
+        previous = cells[-1]
+        if abs(cell - previous) < width:
+            step = 1 if cell > previous else -1
+        else:
+            step = width if cell > previous else -width
+        cells.extend(range(previous + step, cell + step, step))
+
+    return [(0, cell % width - 1, cell // width - 1) for cell in cells]
+
+
+# Some test code
+
+if __name__ == "__main__":
+    from Maze import Maze
+    from MazeworldProblem import MazeworldProblem
+    from astar_search import astar_search
+
+    test_maze = Maze("maze_narrow.maz")
+    test_maze.robotloc = [1, 5]
+    problem = MazeworldProblem(test_maze, (5, 1))
+
+    print(astar_search(problem, problem.manhattan_heuristic))
+    print(jps_search(problem))
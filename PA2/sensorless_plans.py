@@ -0,0 +1,243 @@
+# COSC 76 Fall 2024
+# Wesley Tan
+# PA2 Mazeworld
+# sensorless_plans.py
+
+# An on-disk library of sensorless localisation plans.
+#
+# For a given maze the plan that localises a blind robot from a given belief
+# never changes, so it only needs searching for once. A PlanLibrary keeps
+# solved plans in a file, keyed by a hash of the maze's floor grid and the
+# belief state. Every belief along a solved path is stored with the rest
+# of the path from it: a suffix of an optimal plan is an optimal plan from
+# where it starts, so later queries from a belief the robot passes through
+# on the way (partial knowledge of where it is) are answered without a search.
+#
+# The file holds one JSON record per line, after a header line. New plans
+# are appended to it, and a record for a belief replaces any earlier one,
+# so saving costs only the new records; once the file has grown to twice
+# the plans still held, it is rewritten with just those, through a
+# temporary file. Appends are not atomic: a record cut short by an
+# interrupted write is dropped on loading, and the file rewritten. Beliefs are stored
+# as compressed bitsets, which keeps the records for beliefs on large mazes
+# small. The library is capped at max_bytes of records; the least recently
+# used plans are dropped first.
+
+import base64
+import json
+import os
+import zlib
+from collections import OrderedDict
+from copy import copy
+
+from SearchSolution import SearchSolution, timed_search
+from astar_search import astar_search
+
+LIBRARY_VERSION = 2
+
+# one character per action in a stored plan
+ACTION_CODES = {"north": "n", "south": "s", "east": "e", "west": "w"}
+CODE_ACTIONS = {code: action for action, code in ACTION_CODES.items()}
+
+
+def encode_belief(state):
+    # the bitset's bytes, compressed and made printable
+    data = state.to_bytes((state.bit_length() + 7) // 8, "little")
+    return base64.b85encode(zlib.compress(data)).decode("ascii")
+
+
+def decode_belief(text):
+    return int.from_bytes(zlib.decompress(base64.b85decode(text)), "little")
+
+
+class PlanLibrary:
+    """
+    Bounded LRU store of sensorless plans, saved in a file.
+
+    Plans are stored as strings of action codes, keyed by (maze layout key,
+    belief). Plans found with an inadmissible heuristic are stored all the
+    same, so use one library per heuristic quality if optimal plans matter.
+    """
+
+    def __init__(self, filename="sensorless_plans.json", max_bytes=16 * 2**20):
+        self.filename = filename
+        self.max_bytes = max_bytes
+        # (maze key, belief) -> (plan, record), least recently used first
+        self.plans = OrderedDict()
+        # total length of the records held, and of the file
+        self.size = 0
+        self.file_size = 0
+        # records not yet written to the file
+        self.pending = []
+        self.hits = 0
+        self.misses = 0
+        if os.path.exists(filename):
+            self.load()
+
+    def load(self):
+        with open(self.filename) as f:
+            try:
+                header = json.loads(f.readline())
+            except ValueError:
+                header = None
+            if not isinstance(header, dict) or header.get("version") != LIBRARY_VERSION:
+                raise ValueError(f"{self.filename} is not a sensorless plan library")
+            # later records replace earlier ones for the same belief
+            damaged = False
+            for record in f:
+                try:
+                    if not record.endswith("\n"):
+                        raise ValueError("unterminated record")
+                    key, belief, plan = json.loads(record)
+                    state = decode_belief(belief)
+                except (ValueError, TypeError, zlib.error):
+                    # an interrupted append leaves a partial last record;
+                    #  drop it and anything after it
+                    damaged = True
+                    break
+                self.add(key, state, plan, record.rstrip("\n"))
+        self.file_size = os.path.getsize(self.filename)
+        self.evict()
+        if damaged:
+            self.rewrite()
+
+    def save(self):
+        """
+        Write the plans stored since the last save to the file.
+        """
+        if self.file_size and self.file_size + sum(len(record) + 1 for record in self.pending) <= 2 * self.size:
+            # appending is not atomic, but load drops a record cut short
+            with open(self.filename, "a") as f:
+                for record in self.pending:
+                    f.write(record + "\n")
+                    self.file_size += len(record) + 1
+            self.pending = []
+        else:
+            self.rewrite()
+
+    def rewrite(self):
+        """
+        Replace the file with just the plans held.
+        """
+        # write to a temporary file first so a crash never leaves half a library
+        temporary = self.filename + ".tmp"
+        with open(temporary, "w") as f:
+            f.write(json.dumps({"version": LIBRARY_VERSION}) + "\n")
+            for plan, record in self.plans.values():
+                f.write(record + "\n")
+        os.replace(temporary, self.filename)
+        self.file_size = os.path.getsize(self.filename)
+        self.pending = []
+
+    def add(self, key, state, plan, record=None):
+        # hold a plan as the most recently used; returns its record
+        if record is None:
+            record = json.dumps([key, encode_belief(state), plan])
+        old = self.plans.pop((key, state), None)
+        if old is not None:
+            self.size -= len(old[1]) + 1
+        self.plans[(key, state)] = (plan, record)
+        self.size += len(record) + 1
+        return record
+
+    def evict(self):
+        while self.size > self.max_bytes:
+            plan, record = self.plans.popitem(last=False)[1]
+            self.size -= len(record) + 1
+
+    def lookup(self, problem, state):
+        """
+        Return the stored plan from state as a list of actions, or None.
+        """
+        entry = (problem.maze.layout_key(), state)
+        stored = self.plans.get(entry)
+        if stored is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.plans.move_to_end(entry)
+        return [CODE_ACTIONS[code] for code in stored[0]]
+
+    def store(self, problem, path):
+        """
+        Store the plan along path, a list of belief states ending localised,
+        and the rest of it from every belief on the way.
+        """
+        key = problem.maze.layout_key()
+        plan = ""
+        for state, next_state in zip(reversed(path[:-1]), reversed(path)):
+            action = next(action for successor, action in problem.get_successors(state)
+                          if successor == next_state)
+            plan = ACTION_CODES[action] + plan
+            self.pending.append(self.add(key, state, plan))
+        self.evict()
+
+
+@timed_search
+def library_search(problem, library, heuristic_fn=None, state=None):
+    """
+    Localise a blind robot using a PlanLibrary, searching with A* only if the
+    library has no plan from the belief and saving what the search finds.
+
+    Args:
+        problem (SensorlessProblem): The problem; its maze selects the plans.
+        library (PlanLibrary): The plans to use and add to.
+        heuristic_fn (optional): Heuristic for A* on a miss. Defaults to
+            problem.bounding_box_heuristic.
+        state (int, optional): The belief to localise from. Defaults to
+            problem.start_state.
+
+    Returns:
+        SearchSolution: The path of belief states and its cost; nodes_visited
+        is 0 when the plan came from the library.
+    """
+    if state is None:
+        state = problem.start_state
+    # a localised belief needs no actions, and is not worth a library entry
+    plan = [] if problem.goal_test(state) else library.lookup(problem, state)
+    if plan is None:
+        if heuristic_fn is None:
+            heuristic_fn = problem.bounding_box_heuristic
+        query = copy(problem)
+        query.start_state = state
+        solution = astar_search(query, heuristic_fn)
+        if solution.path:
+            library.store(problem, solution.path)
+            library.save()
+        return solution
+
+    solution = SearchSolution(problem, "Plan library")
+    solution.path = [state]
+    for action in plan:
+        solution.path.append(problem.result(solution.path[-1], action))
+    solution.cost = len(plan)
+    return solution
+
+
+# Some test code
+
+if __name__ == "__main__":
+    from Maze import Maze
+    from SensorlessProblem import SensorlessProblem
+
+    test_problem = SensorlessProblem(Maze("maze3.maz"))
+    library = PlanLibrary("sensorless_plans_test.json", max_bytes=2**20)
+
+    # The first query searches and fills the library; the same query again,
+    #  and one from a belief half way along its path, need no search
+    result = library_search(test_problem, library)
+    print(result)
+    print(library_search(test_problem, library))
+    partial = result.path[len(result.path) // 2]
+    print("Partial knowledge:", test_problem.state_to_string(partial))
+    print(library_search(test_problem, library, state=partial))
+
+    # A fresh library on the same file picks the plans up from disk
+    print(library_search(test_problem, PlanLibrary("sensorless_plans_test.json")))
+
+    # A plan from another start is appended to the file
+    other = test_problem.belief(list(test_problem.locations(test_problem.start_state))[::4])
+    print(library_search(test_problem, library, state=other))
+    print(library_search(test_problem, PlanLibrary("sensorless_plans_test.json"), state=other))
+    print("hits", library.hits, "misses", library.misses, "plans stored", len(library.plans))
+    os.remove("sensorless_plans_test.json")
@@ -0,0 +1,46 @@
+# COSC 76 Fall 2024
+# Wesley Tan
+# PA2 Mazeworld
+# test_cbs.py
+
+from MazeworldProblem import MazeworldProblem
+from Maze import Maze
+from astar_search import astar_search
+from cbs_search import cbs_search
+
+def run_test_case(maze, goal, test_name):
+    print(f"\n{test_name}")
+    mp = MazeworldProblem(maze, goal)
+    print("Start state:", mp.start_state)
+    print("Goal:", goal)
+
+    print("\nA* search over all the robots together:")
+    result_joint = astar_search(mp, mp.bfs_distance_heuristic)
+    print(result_joint)
+
+    print("\nConflict-Based Search:")
+    result_cbs = cbs_search(mp)
+    print(result_cbs)
+    print(f"flowtime {result_cbs.flowtime}, high-level nodes {result_cbs.high_level_nodes}, "
+          f"handed over to independence detection: {result_cbs.fallback}")
+
+    # CBS must find a plan whenever joint A* does, and a valid one: every
+    #  step a legal move of the full problem, at the cost claimed
+    assert bool(result_cbs.path) == bool(result_joint.path)
+    if result_cbs.path:
+        assert result_cbs.path[0] == mp.start_state and mp.goal_test(result_cbs.path[-1])
+        cost = 0
+        for state, next_state in zip(result_cbs.path, result_cbs.path[1:]):
+            assert next_state in [successor for successor, action in mp.get_successors(state)]
+            cost += mp.get_transition_cost(next_state, state)
+        assert cost == result_cbs.cost >= result_joint.cost
+
+# Test case 1: Two robots swapping places in a corridor with one side cell (maze3.maz)
+run_test_case(Maze("maze3.maz").with_robots([1, 0, 1, 1]), (1, 1, 1, 0),
+              "Test case 1: Two robots swapping in maze3.maz")
+
+# Test case 2: Three robots reversing their order in a one-cell-wide
+#  corridor with a two-cell alcove (maze_corridor.maz); CBS alone used to
+#  run out of constraint tree nodes here
+run_test_case(Maze("maze_corridor.maz"), (3, 1, 2, 1, 1, 1),
+              "Test case 2: Three robots reversing in a narrow corridor (maze_corridor.maz)")
@@ -23,6 +23,10 @@ def run_test_case(maze, goal, test_name):
     result_manhattan = astar_search(mp, mp.manhattan_heuristic)
     print(result_manhattan)
 
+    print("\nA* search with BFS distance heuristic:")
+    result_distance = astar_search(mp, mp.bfs_distance_heuristic)
+    print(result_distance)
+
     if result_manhattan.path:
         print("\nAnimating solution path:")
         mp.animate_path(result_manhattan.path)
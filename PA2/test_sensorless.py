@@ -11,7 +11,7 @@ def run_test_case(maze_file, test_name):
     print(f"\n{test_name}")
     maze = Maze(maze_file)
     problem = SensorlessProblem(maze)
-    print(f"Initial belief state size: {len(problem.start_state)}")
+    print(f"Initial belief state size: {problem.start_state.bit_count()}")
 
     result1 = astar_search(problem, problem.manhattan_heuristic)
     print(result1)
@@ -22,6 +22,10 @@ def run_test_case(maze_file, test_name):
     result3 = astar_search(problem, problem.null_heuristic)
     print(result3)
 
+    # Linear-time bounds, in the same names-on-the-problem style
+    for heuristic_name in ("bounding_box_heuristic", "maze_distance_heuristic"):
+        print(astar_search(problem, getattr(problem, heuristic_name)))
+
     if result1.path:
         print("Animating solution path:")
         problem.animate_path(result1.path)
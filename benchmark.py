@@ -0,0 +1,266 @@
+# COSC 76
+# benchmark.py
+#
+# Runs the PA1 uninformed searches and the PA2 A* search over a fixed
+# catalogue of chickens-and-foxes problems and mazes, and writes a JSON
+# report of nodes visited, time and peak memory. Two reports can be
+# compared to catch performance regressions:
+#
+#   python benchmark.py --output before.json
+#   python benchmark.py --output after.json --compare before.json
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tracemalloc
+from time import perf_counter
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# PA1 and PA2 each have their own SearchSolution module, so each directory
+# is imported on its own and its modules are dropped from sys.modules
+# afterwards; the loaded modules keep references to their own copies.
+def load_modules(directory, names):
+    path = os.path.join(ROOT, directory)
+    sys.path.insert(0, path)
+    try:
+        modules = {name: importlib.import_module(name) for name in names}
+    finally:
+        sys.path.remove(path)
+        for module in list(sys.modules.values()):
+            if getattr(module, "__file__", None) and \
+               os.path.dirname(os.path.abspath(module.__file__)) == path:
+                del sys.modules[module.__name__]
+    return modules
+
+PA1 = load_modules("PA1", ["FoxProblem", "SearchSolution", "uninformed_search"])
+PA2 = load_modules("PA2", ["Maze", "MazeworldProblem", "SearchSolution", "astar_search"])
+
+
+class UninformedView:
+    """
+    Presents a Mazeworld problem through the PA1 interface
+    (is_goal_state and plain successor states).
+    """
+
+    def __init__(self, problem):
+        self.problem = problem
+        self.start_state = problem.start_state
+
+    def is_goal_state(self, state):
+        return self.problem.goal_test(state)
+
+    def get_successors(self, state):
+        return [successor for successor, action in self.problem.get_successors(state)]
+
+    def __str__(self):
+        return str(self.problem)
+
+
+class InformedView:
+    """
+    Presents a PA1 problem through the PA2 interface (goal_test,
+    (state, action) successors and unit transition costs).
+    """
+
+    def __init__(self, problem):
+        self.problem = problem
+        self.start_state = problem.start_state
+
+    def goal_test(self, state):
+        return self.problem.is_goal_state(state)
+
+    def get_successors(self, state):
+        return [(successor, None) for successor in self.problem.get_successors(state)]
+
+    def get_transition_cost(self, next_state, current_state):
+        return 1
+
+    def null_heuristic(self, state):
+        return 0
+
+    def __str__(self):
+        return str(self.problem)
+
+
+# Each maze entry: file, robot start locations (None keeps the file's
+# \robot lines), goal locations
+MAZES = {
+    "maze1": ("maze1.maz", None, (2, 2)),
+    "maze2": ("maze2.maz", None, (3, 0)),
+    "maze3": ("maze3.maz", None, (1, 4, 1, 3, 1, 2)),
+    "maze_complex": ("maze_complex.maz", [1, 1, 3, 1, 5, 1], (1, 5, 3, 5, 5, 5)),
+    "maze_narrow": ("maze_narrow.maz", [1, 5], (5, 1)),
+    "maze_swap": ("maze_swap.maz", None, (3, 1, 1, 3)),
+}
+
+FOXES = {
+    "fox_3_3": (3, 3, 1),
+    "fox_5_4": (5, 4, 1),
+    "fox_5_5": (5, 5, 1),
+    "fox_50_49": (50, 49, 1),
+}
+
+# Depth-first searches without a visited set blow up on the larger joint
+# state spaces, so they only run where they finish in reasonable time
+DEPTH_FIRST_MAZES = {"maze1", "maze2", "maze_narrow", "maze_swap"}
+
+
+def make_maze_problem(name):
+    filename, robots, goal = MAZES[name]
+    maze = PA2["Maze"].Maze(os.path.join(ROOT, "PA2", filename))
+    if robots is not None:
+        maze.robotloc = list(robots)
+    return PA2["MazeworldProblem"].MazeworldProblem(maze, goal)
+
+
+def catalogue():
+    """
+    Return a list of (problem name, search name, run) triples, where run()
+    builds a fresh problem and returns the search's SearchSolution.
+    """
+    search = PA1["uninformed_search"]
+    astar_search = PA2["astar_search"].astar_search
+    FoxProblem = PA1["FoxProblem"].FoxProblem
+    uninformed = [("bfs", search.bfs_search), ("dfs", search.dfs_search), ("ids", search.ids_search)]
+    depth_first = {"dfs", "ids"}
+    cases = []
+
+    for name, start in FOXES.items():
+        for search_name, search_fn in uninformed:
+            cases.append((name, search_name,
+                          lambda search_fn=search_fn, start=start: search_fn(FoxProblem(start))))
+        cases.append((name, "astar", lambda start=start: _astar_fox(astar_search, FoxProblem(start))))
+
+    for name in MAZES:
+        for search_name, search_fn in uninformed:
+            if search_name in depth_first and name not in DEPTH_FIRST_MAZES:
+                continue
+            cases.append((name, search_name,
+                          lambda search_fn=search_fn, name=name:
+                              search_fn(UninformedView(make_maze_problem(name)))))
+        cases.append((name, "astar", lambda name=name: _astar_maze(astar_search, make_maze_problem(name))))
+
+    return cases
+
+
+def _astar_fox(astar_search, problem):
+    view = InformedView(problem)
+    return astar_search(view, view.null_heuristic)
+
+
+def _astar_maze(astar_search, problem):
+    return astar_search(problem, problem.manhattan_heuristic)
+
+
+def summarise(samples):
+    return {
+        "mean": statistics.mean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "max": max(samples),
+    }
+
+
+def run_case(run, repeat):
+    """
+    Run one search repeat times for timing, plus once more under tracemalloc
+    for peak memory (kept separate since tracing slows the search down).
+    """
+    times = []
+    solution = None
+    for _ in range(repeat):
+        start = perf_counter()
+        solution = run()
+        times.append(perf_counter() - start)
+
+    tracemalloc.start()
+    run()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    # One more run with the search instrumentation on for the phase metrics
+    PA1["SearchSolution"].SearchSolution.instrument = True
+    PA2["SearchSolution"].SearchSolution.instrument = True
+    try:
+        metrics = run().metrics
+    finally:
+        PA1["SearchSolution"].SearchSolution.instrument = False
+        PA2["SearchSolution"].SearchSolution.instrument = False
+
+    return {
+        "nodes_visited": solution.nodes_visited,
+        "solution_length": len(solution.path),
+        "time": summarise(times),
+        "peak_memory_bytes": peak_memory,
+        "metrics": metrics,
+    }
+
+
+def run_benchmarks(repeat, only=None):
+    results = {}
+    for problem_name, search_name, run in catalogue():
+        key = f"{problem_name}/{search_name}"
+        if only and not any(pattern in key for pattern in only):
+            continue
+        results[key] = run_case(run, repeat)
+        print(f"{key:28s} nodes {results[key]['nodes_visited']:8d}  "
+              f"time {results[key]['time']['median'] * 1000:9.2f} ms  "
+              f"memory {results[key]['peak_memory_bytes'] / 1024:9.1f} KiB")
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(report, baseline, tolerance):
+    """
+    Print the benchmarks whose node count, median time or peak memory grew by more than
+    tolerance (a fraction) relative to the baseline report.
+
+    Returns:
+        int: The number of regressions found.
+    """
+    regressions = 0
+    for key, result in report["results"].items():
+        old = baseline["results"].get(key)
+        if old is None:
+            continue
+        checks = [
+            ("nodes", old["nodes_visited"], result["nodes_visited"]),
+            ("time", old["time"]["median"], result["time"]["median"]),
+            ("memory", old["peak_memory_bytes"], result["peak_memory_bytes"]),
+        ]
+        for label, before, after in checks:
+            if before and (after - before) / before > tolerance:
+                regressions += 1
+                print(f"REGRESSION {key} {label}: {before:.6g} -> {after:.6g}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the PA1 and PA2 searches.")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument("--output", default="bench_output.json", help="where to write the JSON report")
+    parser.add_argument("--only", nargs="*", help="run only benchmarks whose name contains one of these")
+    parser.add_argument("--compare", help="baseline JSON report to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative growth before reporting a regression")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.repeat, args.only)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"report written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        sys.exit(1 if compare(report, baseline, args.tolerance) else 0)